@@ -0,0 +1,49 @@
+"""
+Measures how the cost of an ArenaModel tick scales with the number of
+balls, from 1 to 10,000.
+
+Usage: python -m benchmarks.bench_arena [--ticks N]
+"""
+import argparse
+import math
+import time
+
+from model.arena_model import ArenaModel, Side, four_player_paddles
+
+BALL_COUNTS = (1, 10, 100, 1_000, 10_000)
+BALL_RADIUS = 2
+DENSITY = 0.02  # fraction of the field covered by balls
+
+
+def measure(num_balls: int, ticks: int) -> float:
+    """Returns the time of a tick with 'num_balls' balls, in seconds"""
+    # Grow the field with the number of balls to keep the density constant
+    side = max(500, int(math.sqrt(num_balls * math.pi * BALL_RADIUS**2 / DENSITY)))
+    arena = ArenaModel(
+        side,
+        side,
+        num_balls,
+        four_player_paddles(side, side),
+        goals=tuple(Side),
+        ball_radius=BALL_RADIUS,
+        seed=0,
+    )
+    start = time.perf_counter()
+    for _ in range(ticks):
+        arena.process()
+    return (time.perf_counter() - start) / ticks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ticks", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'balls':>8} {'ms/tick':>10} {'us/ball':>10}")
+    for num_balls in BALL_COUNTS:
+        tick_time = measure(num_balls, args.ticks)
+        print(f"{num_balls:>8} {tick_time * 1e3:>10.3f} {tick_time * 1e6 / num_balls:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Measures how the throughput of the ShardPool scales with the number of
+worker processes.
+
+Usage: python -m benchmarks.bench_sharding [--matches N] [--seconds S]
+"""
+import argparse
+import os
+import time
+
+from server.sharding import ShardPool
+
+
+def measure(num_matches: int, num_workers: int, seconds: float) -> float:
+    """Returns the match-ticks per second of a pool with 'num_workers'"""
+    with ShardPool(num_matches, num_workers) as pool:
+        time.sleep(0.5)  # let the workers start
+        start_ticks, start = pool.total_ticks(), time.perf_counter()
+        time.sleep(seconds)
+        end_ticks, end = pool.total_ticks(), time.perf_counter()
+    return (end_ticks - start_ticks) / (end - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--matches", type=int, default=256)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    workers = sorted({1, *range(2, cpus + 1, 2), cpus})
+    print(f"{'workers':>8} {'match-ticks/s':>15} {'speedup':>8}")
+    baseline = None
+    for num_workers in workers:
+        throughput = measure(args.matches, num_workers, args.seconds)
+        baseline = baseline or throughput
+        print(f"{num_workers:>8} {throughput:>15,.0f} {throughput / baseline:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
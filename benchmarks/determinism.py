@@ -0,0 +1,142 @@
+"""
+Checks that the fixed-point physics is deterministic: seeded random
+matches are simulated with GameModel and BatchGameModel in fixed-point
+mode, both must give the same states bit for bit, and a digest of the
+states every 'interval' ticks is compared against a recorded trace.
+
+Usage:
+    python -m benchmarks.determinism record [PATH] [--matches N] [--ticks N]
+                                                   [--seed N] [--interval N]
+    python -m benchmarks.determinism check [PATH]
+
+A trace recorded on one machine must pass the check on every other one.
+PATH defaults to the reference trace committed next to this module,
+recorded with the default parameters; it must only be recorded again
+when the physics change on purpose.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+
+import numpy as np
+
+from controller.replay import apply_input
+from model.batch_model import BatchGameModel
+from model.game_model import FIXED_ONE, PADDLE_DELTA_Y, GameModel
+from model.state import STATE_SIZE
+
+FIELD_WIDTH, FIELD_HEIGHT = 700, 500
+MATCHES = 16
+TICKS = 20_000
+SEED = 0
+INTERVAL = 600  # ticks between digests
+TRACE = os.path.join(os.path.dirname(__file__), "determinism_trace.json")
+
+
+class DeterminismError(Exception):
+    """Raised when two simulations of the same match diverge"""
+
+
+def trace(
+    matches: int = MATCHES, ticks: int = TICKS, seed: int = SEED, interval: int = INTERVAL
+) -> list[str]:
+    """Simulates 'matches' matches with random inputs drawn from 'seed' and
+    returns the digest of their states every 'interval' ticks. Raises
+    DeterminismError if GameModel and BatchGameModel diverge."""
+    rng = random.Random(seed)
+    models = [GameModel(FIELD_WIDTH, FIELD_HEIGHT, fixed_point=True) for _ in range(matches)]
+    batch = BatchGameModel(matches, FIELD_WIDTH, FIELD_HEIGHT, fixed_point=True)
+    left_dy = np.empty(matches, dtype=np.int64)
+    right_dy = np.empty(matches, dtype=np.int64)
+    digests = []
+    for tick in range(1, ticks + 1):
+        for i, model in enumerate(models):
+            left, right = rng.randint(-1, 1), rng.randint(-1, 1)
+            apply_input(model, left, right)
+            model.process()
+            left_dy[i] = left * PADDLE_DELTA_Y
+            right_dy[i] = right * PADDLE_DELTA_Y
+        batch.move_paddles(left_dy, right_dy)
+        batch.process()
+
+        if tick % interval == 0:
+            states = model_states(models)
+            if not np.array_equal(states, batch_states(batch)):
+                raise DeterminismError(f"BatchGameModel diverged from GameModel at tick {tick}")
+            digests.append(hashlib.sha256(states.astype("<f8").tobytes()).hexdigest())
+    return digests
+
+
+def model_states(models: list[GameModel]) -> np.ndarray:
+    """Returns the states (see model.state) of 'models', one per row"""
+    return np.array([model.snapshot() for model in models], dtype=np.float64)
+
+
+def batch_states(batch: BatchGameModel) -> np.ndarray:
+    """Returns the states of the matches of 'batch', laid out as
+    'model_states'"""
+    states = np.empty((batch.num_matches, STATE_SIZE), dtype=np.float64)
+    columns = (
+        batch.ball_x / FIXED_ONE,
+        batch.ball_y / FIXED_ONE,
+        batch.ball_vx / FIXED_ONE,
+        batch.ball_vy / FIXED_ONE,
+        batch.left_y,
+        batch.right_y,
+        batch.left_score,
+        batch.right_score,
+    )
+    for index, column in enumerate(columns):
+        states[:, index] = column
+    return states
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Fixed-point determinism check")
+    parser.add_argument("command", choices=("record", "check"))
+    parser.add_argument(
+        "path", nargs="?", default=TRACE, help="trace file (default: the reference trace)"
+    )
+    parser.add_argument("--matches", type=int, default=MATCHES)
+    parser.add_argument("--ticks", type=int, default=TICKS)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--interval", type=int, default=INTERVAL)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        params = {
+            "matches": args.matches,
+            "ticks": args.ticks,
+            "seed": args.seed,
+            "interval": args.interval,
+        }
+        digests = trace(**params)
+        with open(args.path, "w") as file:
+            json.dump({**params, "digests": digests}, file, indent=2)
+        print(f"Recorded {len(digests)} digests to {args.path}")
+        return 0
+
+    with open(args.path) as file:
+        recorded = json.load(file)
+    expected = recorded.pop("digests")
+    try:
+        digests = trace(**recorded)
+    except DeterminismError as error:
+        print(error)
+        return 1
+    for index, (digest, recorded_digest) in enumerate(zip(digests, expected)):
+        if digest != recorded_digest:
+            print(f"Diverged from the trace at tick {(index + 1) * recorded['interval']}")
+            return 1
+    if len(digests) != len(expected):
+        print(f"Expected {len(expected)} digests, got {len(digests)}")
+        return 1
+    print(f"Deterministic: {len(digests)} digests match")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
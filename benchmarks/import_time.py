@@ -0,0 +1,63 @@
+"""
+Measures the cold import time of the modules used by headless
+simulations and checks it against a budget. Also checks that importing
+them doesn't load pygame.
+
+Usage: python -m benchmarks.import_time [--budget MS] [--runs N]
+"""
+import argparse
+import subprocess
+import sys
+
+# Modules imported by a headless simulation worker
+HEADLESS_MODULES = (
+    "model.game_model",
+    "model.paddle_listener",
+    "event.event",
+    "view.null_view",
+    "controller.game_controller",
+    "controller.ai_input",
+    "controller.replay",
+)
+IMPORT_BUDGET_MS = 80.0  # maximum import time of HEADLESS_MODULES
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+{imports}
+elapsed = time.perf_counter() - start
+# pygame may be registered as a lazy module, it's loaded if its
+# submodules have been imported
+print(elapsed * 1000, "pygame.base" in sys.modules)
+"""
+
+
+def measure(modules: tuple[str, ...]) -> tuple[float, bool]:
+    """Imports 'modules' in a new interpreter. Returns the time it took in
+    milliseconds and whether pygame was loaded."""
+    code = PROBE.format(imports="\n".join(f"import {module}" for module in modules))
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.split()
+    return float(output[0]), output[1] == "True"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Headless import time budget")
+    parser.add_argument("--budget", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    results = [measure(HEADLESS_MODULES) for _ in range(args.runs)]
+    best = min(elapsed for elapsed, _ in results)
+    pygame_loaded = any(loaded for _, loaded in results)
+    print(f"headless import time: {best:.1f} ms (budget {args.budget:.1f} ms)")
+    if pygame_loaded:
+        print("FAIL: importing the headless modules loads pygame")
+    if best > args.budget:
+        print("FAIL: import time over budget")
+    return 1 if pygame_loaded or best > args.budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
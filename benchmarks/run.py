@@ -0,0 +1,329 @@
+"""
+Benchmark suite of the hot paths of the game: the model step, the
+collision functions, the entity edges, the event bus and the render
+functions (drawing to an offscreen surface).
+
+Usage:
+    python -m benchmarks.run [--filter TEXT] [--output PATH]
+                             [--baseline PATH | --no-baseline]
+                             [--threshold FRACTION]
+
+The results are written as JSON to 'output', if given. Every benchmark
+slower than the baseline (a previous output, by default the one committed
+as benchmarks/baseline.json) by more than 'threshold' is reported as a
+regression and the exit status is 1. The committed baseline is recorded
+with '--no-baseline --output benchmarks/baseline.json' on the reference
+machine; timings from other machines are only comparable to their own.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from typing import Callable
+
+from event.event import EventBus, EventType
+from model.ball import Ball
+from model.game_model import (
+    GameModel,
+    handle_floor_ceiling_collision,
+    handle_paddle_collision,
+    has_scored,
+    sweep_ball,
+)
+
+# A benchmark returns the function to time, called without arguments
+Benchmark = Callable[[], Callable[[], object]]
+
+BENCHMARKS: dict[str, Benchmark] = {}
+MIN_REPEAT_TIME = 0.05  # seconds every repeat of a benchmark lasts at least
+REPEATS = 5
+THRESHOLD = 0.10  # relative slowdown considered a regression
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def benchmark(name: str):
+    """Registers the decorated function as the benchmark 'name'"""
+
+    def register(fn: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = fn
+        return fn
+
+    return register
+
+
+def measure(fn: Callable[[], object]) -> float:
+    """Returns the best time per call of 'fn' in nanoseconds"""
+    loops = 1
+    while True:
+        elapsed = _time(fn, loops)
+        if elapsed >= MIN_REPEAT_TIME:
+            break
+        loops *= 10 if elapsed < MIN_REPEAT_TIME / 10 else 2
+    best = min([elapsed] + [_time(fn, loops) for _ in range(REPEATS - 1)])
+    return 1e9 * best / loops
+
+
+def _time(fn: Callable[[], object], loops: int) -> float:
+    iterations = range(loops)
+    start = time.perf_counter()
+    for _ in iterations:
+        fn()
+    return time.perf_counter() - start
+
+
+# ****************************************************************** #
+# ***************************** Model ****************************** #
+# ****************************************************************** #
+
+
+@benchmark("model.process")
+def bench_process():
+    model = GameModel(700, 500)
+    return model.process
+
+
+@benchmark("model.process_continuous")
+def bench_process_continuous():
+    model = GameModel(700, 500, continuous_collision=True)
+    return model.process
+
+
+@benchmark("model.process_fixed_point")
+def bench_process_fixed_point():
+    model = GameModel(700, 500, fixed_point=True)
+    return model.process
+
+
+@benchmark("model.handle_paddle_collision.miss")
+def bench_paddle_collision_miss():
+    model = GameModel(700, 500)
+    ball, paddle = model.ball, model.player_left.paddle
+    return lambda: handle_paddle_collision(ball, paddle)
+
+
+@benchmark("model.handle_paddle_collision.hit")
+def bench_paddle_collision_hit():
+    model = GameModel(700, 500)
+    ball, paddle = model.ball, model.player_left.paddle
+    ball.x = paddle.edge.x + ball.radius
+    ball.vx = -5
+
+    def hit():
+        ball.vx = -5
+        handle_paddle_collision(ball, paddle)
+
+    return hit
+
+
+@benchmark("model.handle_floor_ceiling_collision")
+def bench_floor_ceiling_collision():
+    model = GameModel(700, 500)
+    ball = model.ball
+    return lambda: handle_floor_ceiling_collision(ball, model.height)
+
+
+@benchmark("model.has_scored")
+def bench_has_scored():
+    model = GameModel(700, 500)
+    return lambda: has_scored(model.ball, model.width)
+
+
+@benchmark("model.sweep_ball")
+def bench_sweep_ball():
+    model = GameModel(700, 500)
+    ball = model.ball
+    paddles = (model.player_left.paddle, model.player_right.paddle)
+
+    def sweep():
+        ball.x, ball.y, ball.vx, ball.vy = 350, 250, 5, 3
+        sweep_ball(ball, model.height, paddles)
+
+    return sweep
+
+
+@benchmark("model.ball_edge")
+def bench_ball_edge():
+    ball = Ball(350, 250, 10, 5, -3)
+    return lambda: ball.edge
+
+
+@benchmark("model.paddle_edge")
+def bench_paddle_edge():
+    paddle = GameModel(700, 500).player_left.paddle
+    return lambda: paddle.edge
+
+
+# ****************************************************************** #
+# ***************************** Events ***************************** #
+# ****************************************************************** #
+
+
+def _bus_with_handlers(count: int) -> EventBus:
+    bus = EventBus()
+    for _ in range(count):
+        bus.subscribe(EventType.paddle_up, lambda data: None)
+    return bus
+
+
+@benchmark("event.post.1_handler")
+def bench_post_1():
+    bus = _bus_with_handlers(1)
+    return lambda: bus.post(EventType.paddle_up, None)
+
+
+@benchmark("event.post.10_handlers")
+def bench_post_10():
+    bus = _bus_with_handlers(10)
+    return lambda: bus.post(EventType.paddle_up, None)
+
+
+@benchmark("event.enqueue_drain")
+def bench_enqueue_drain():
+    bus = _bus_with_handlers(1)
+    data = object()
+
+    def enqueue_drain():
+        bus.enqueue(EventType.paddle_up, data)
+        bus.enqueue(EventType.paddle_up, data)
+        bus.drain()
+
+    return enqueue_drain
+
+
+# ****************************************************************** #
+# ***************************** Render ***************************** #
+# ****************************************************************** #
+
+
+def _render_benchmarks() -> None:
+    """Registers the render benchmarks if pygame is available"""
+    try:
+        import pygame
+        from controller import game_controller as gc
+        from view.text_cache import TextCache
+        from view.sprite_atlas import SpriteAtlas
+    except ImportError:
+        return
+
+    def offscreen():
+        pygame.font.init()
+        return pygame.Surface((700, 500))
+
+    def render_benchmark(name: str, make_render_fn):
+        def bench():
+            window = offscreen()
+            render_fn = make_render_fn()
+            return lambda: render_fn(window)
+
+        BENCHMARKS[name] = bench
+
+    model = GameModel(700, 500)
+    render_benchmark("render.background", lambda: gc.render_background(gc.BACKGROUND_COLOR))
+    render_benchmark(
+        "render.mid_line", lambda: gc.render_mid_line(700, 500, gc.MID_LINE_COLOR)
+    )
+    render_benchmark("render.ball", lambda: gc.render_ball(model.ball, gc.BALL_COLOR))
+    render_benchmark(
+        "render.paddle",
+        lambda: gc.render_paddle(model.player_left.paddle, gc.LEFT_PADDLE_COLOR),
+    )
+    atlas = SpriteAtlas()
+
+    def blit_sprite(sprite_fn):
+        return lambda window: window.blit(*sprite_fn(window))
+
+    render_benchmark(
+        "render.ball_sprite",
+        lambda: blit_sprite(gc.ball_sprite(model.ball, gc.BALL_COLOR, atlas)),
+    )
+    render_benchmark(
+        "render.paddle_sprite",
+        lambda: blit_sprite(
+            gc.paddle_sprite(model.player_left.paddle, gc.LEFT_PADDLE_COLOR, atlas)
+        ),
+    )
+    render_benchmark(
+        "render.score", lambda: gc.render_score(175, 20, model.player_left, TextCache())
+    )
+    render_benchmark(
+        "render.victory",
+        lambda: gc.render_victory(700, 500, model.player_left, TextCache()),
+    )
+
+
+_render_benchmarks()
+
+
+# ****************************************************************** #
+# ****************************** Main ****************************** #
+# ****************************************************************** #
+
+
+def run(name_filter: str = "") -> dict[str, float]:
+    """Runs the benchmarks whose name contains 'name_filter' and returns
+    their time per call in nanoseconds"""
+    results = {}
+    for name, bench in BENCHMARKS.items():
+        if name_filter not in name:
+            continue
+        results[name] = measure(bench())
+        print(f"{name:<40} {results[name]:>12,.1f} ns")
+    return results
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], threshold: float):
+    """Returns the benchmarks slower than 'baseline' by more than 'threshold'
+    as (name, baseline ns, current ns) tuples"""
+    return [
+        (name, baseline[name], ns)
+        for name, ns in results.items()
+        if name in baseline and ns > baseline[name] * (1 + threshold)
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Pong benchmark suite")
+    parser.add_argument("--filter", default="", help="run only the benchmarks containing TEXT")
+    parser.add_argument("--output", default=None, help="results file")
+    parser.add_argument(
+        "--baseline", default=BASELINE, help="results to compare against (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--no-baseline",
+        dest="baseline",
+        action="store_const",
+        const=None,
+        help="don't compare against a baseline",
+    )
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = parser.parse_args()
+
+    results = run(args.filter)
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "results_ns": results,
+                },
+                file,
+                indent=2,
+            )
+
+    if args.baseline is None:
+        return 0
+    with open(args.baseline) as file:
+        baseline = json.load(file)["results_ns"]
+    regressions = compare(results, baseline, args.threshold)
+    for name, before, after in regressions:
+        print(f"REGRESSION {name}: {before:,.1f} ns -> {after:,.1f} ns (+{after / before - 1:.0%})")
+    if not regressions:
+        print(f"No regressions beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
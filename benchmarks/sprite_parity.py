@@ -0,0 +1,88 @@
+"""
+Checks that the sprites of the ball and the paddles (view.sprite_atlas)
+draw the same pixels and report the same dirty rects as the pygame.draw
+calls they replace, including fractional positions and positions where
+the entity is clipped by the edges of the window. The empty rects of the
+entities completely outside the window only need to be empty.
+
+Usage: python -m benchmarks.sprite_parity
+"""
+import itertools
+import sys
+
+import pygame
+
+from controller import game_controller as gc
+from model.ball import Ball
+from model.game_model import BALL_RADIUS, PADDLE_HEIGHT, PADDLE_WIDTH
+from model.paddle import Paddle, PaddleType
+from view.game_view import GameView
+from view.scene import Scene
+from view.sprite_atlas import SpriteAtlas, sprite_node
+
+WIDTH, HEIGHT = 200, 150
+COORDINATES = (-25, -10, -3.5, -0.5, 0, 2.49, 3.2, 5.5, 77.7, 140.5, 145.2, 190.5, 199, 215)
+
+
+def compare(render_fn, sprite_fn) -> str | None:
+    """Draws with 'render_fn' and with the sprite of 'sprite_fn', both alone
+    and batched by GameView. Returns a description of the first
+    difference, None if there isn't any."""
+    expected_surface = pygame.Surface((WIDTH, HEIGHT))
+    expected_rect = render_fn(expected_surface)
+    expected = pygame.image.tobytes(expected_surface, "RGB")
+
+    node = sprite_node(sprite_fn)
+    surface = pygame.Surface((WIDTH, HEIGHT))
+    rect = node.render_fn(surface)
+    if pygame.image.tobytes(surface, "RGB") != expected:
+        return "different pixels"
+    if not same_area(rect, expected_rect):
+        return f"rect {rect} instead of {expected_rect}"
+
+    view = GameView()
+    view.window = pygame.Surface((WIDTH, HEIGHT))
+    view.dirty_rects = []
+    view.full_update = False
+    scene = Scene()
+    scene.add(node)
+    view.render_scene(scene)
+    if pygame.image.tobytes(view.window, "RGB") != expected:
+        return "different pixels when batched"
+    if len(view.dirty_rects) != 1 or not same_area(view.dirty_rects[0], expected_rect):
+        return f"batched rects {view.dirty_rects} instead of {expected_rect}"
+    return None
+
+
+def same_area(rect: pygame.Rect, expected: pygame.Rect) -> bool:
+    """Returns True if 'rect' is 'expected' or if both are empty"""
+    return rect == expected or not (rect.width and rect.height or expected.width and expected.height)
+
+
+def main() -> int:
+    failures = []
+    atlas = SpriteAtlas()
+    for x, y in itertools.product(COORDINATES, repeat=2):
+        ball = Ball(x, y, BALL_RADIUS, 0, 0)
+        difference = compare(
+            gc.render_ball(ball, gc.BALL_COLOR), gc.ball_sprite(ball, gc.BALL_COLOR, atlas)
+        )
+        if difference:
+            failures.append(f"ball at ({x}, {y}): {difference}")
+
+        paddle = Paddle(x, y, PADDLE_WIDTH, PADDLE_HEIGHT, PaddleType.LEFT_PADDLE)
+        difference = compare(
+            gc.render_paddle(paddle, gc.LEFT_PADDLE_COLOR),
+            gc.paddle_sprite(paddle, gc.LEFT_PADDLE_COLOR, atlas),
+        )
+        if difference:
+            failures.append(f"paddle at ({x}, {y}): {difference}")
+
+    for failure in failures:
+        print(failure)
+    print(f"{len(COORDINATES) ** 2 * 2 - len(failures)} positions match, {len(failures)} differ")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""
+This module implements the computer players. Instead of simulating the
+ball tick by tick, a computer player computes in closed form where the
+ball will cross the edge of its paddle, unfolding the reflections on the
+floor and the ceiling, and only recomputes it after the ball bounces.
+"""
+import random
+from dataclasses import dataclass
+
+from model.arena_model import ArenaModel
+from model.ball import Ball
+from model.game_model import GameModel, PADDLE_DELTA_Y
+from model.paddle import Paddle, PaddleType
+
+
+@dataclass(frozen=True)
+class Difficulty:
+    reaction_ticks: int  # ticks before reacting to a new trajectory of the ball
+    aim_error: float  # maximum error of the predicted intercept, in pixels
+
+
+EASY = Difficulty(reaction_ticks=20, aim_error=60)
+NORMAL = Difficulty(reaction_ticks=10, aim_error=30)
+HARD = Difficulty(reaction_ticks=0, aim_error=0)
+
+
+def predict_intercept(ball: Ball, target_x: float, height: int) -> float | None:
+    """Returns the 'y' coordinate of the center of the ball when it reaches
+    'target_x', taking into account the bounces on the floor and ceiling.
+    Returns None if the ball is not moving towards 'target_x'."""
+    if ball.vx == 0:
+        return None
+    t = (target_x - ball.x) / ball.vx
+    if t < 0:
+        return None
+
+    # Position of the ball if there were no floor or ceiling
+    y = ball.y + ball.vy * t
+    # Fold it back into the field: the center of the ball moves between
+    # 'low' and 'high', every bounce mirrors the trajectory.
+    low, high = ball.radius, height - ball.radius
+    span = high - low
+    if span <= 0:
+        return low
+    u = (y - low) % (2 * span)
+    return low + (u if u <= span else 2 * span - u)
+
+
+class PaddleAI:
+    """
+    Computer player controlling one paddle.
+
+    Attributes:
+        paddle_type (PaddleType) : paddle controlled by the computer
+        difficulty (Difficulty) : reaction delay and aim error
+        target_y (float) : 'y' coordinate the paddle is moving to
+    """
+
+    def __init__(
+        self,
+        paddle_type: PaddleType,
+        difficulty: Difficulty = NORMAL,
+        seed: int | None = None,
+    ) -> None:
+        self.paddle_type = paddle_type
+        self.difficulty = difficulty
+        self.random = random.Random(seed)
+        self.target_y: float | None = None
+        self._next_target: float | None = None
+        self._reaction = 0  # ticks left before aiming at '_next_target'
+        self._trajectory = None  # trajectory the prediction was made for
+        self._approach = None  # approach of the ball the aim error was drawn for
+        self._error = 0.0  # aim error of the current approach
+
+    def paddle(self, model: GameModel) -> Paddle:
+        if self.paddle_type == PaddleType.LEFT_PADDLE:
+            return model.player_left.paddle
+        return model.player_right.paddle
+
+    def direction(self, model: GameModel) -> int:
+        """Returns the direction the paddle has to move in this tick"""
+        ball = model.ball
+        paddle = self.paddle(model)
+
+        # The velocity of the ball only changes when it bounces, and the
+        # scores when it's reset, so the prediction stays valid until then.
+        trajectory = (
+            ball.vx,
+            ball.vy,
+            model.player_left.score,
+            model.player_right.score,
+        )
+        if trajectory != self._trajectory:
+            self._trajectory = trajectory
+            # A wall bounce only refines the prediction: the player reacts
+            # and draws its aim error once per approach of the ball
+            if paddle.paddle_type == PaddleType.LEFT_PADDLE:
+                coming = ball.vx < 0
+            else:
+                coming = ball.vx > 0
+            approach = (coming, trajectory[2], trajectory[3])
+            if approach != self._approach:
+                self._approach = approach
+                error = self.difficulty.aim_error
+                self._error = self.random.uniform(-error, error)
+                self._reaction = self.difficulty.reaction_ticks
+            self._next_target = self.predict(model, ball, paddle)
+
+        if self._reaction > 0:
+            self._reaction -= 1
+        else:
+            self.target_y = self._next_target
+
+        if self.target_y is None:
+            return 0
+        center = paddle.y + paddle.height / 2
+        if self.target_y < center - PADDLE_DELTA_Y:
+            return -1
+        if self.target_y > center + PADDLE_DELTA_Y:
+            return 1
+        return 0
+
+    def predict(self, model: GameModel, ball: Ball, paddle: Paddle) -> float:
+        """Returns the 'y' coordinate the paddle should aim at"""
+        if paddle.paddle_type == PaddleType.LEFT_PADDLE:
+            target_x = paddle.edge.x + ball.radius
+        else:
+            target_x = paddle.edge.x - ball.radius
+        y = predict_intercept(ball, target_x, model.height)
+        if y is None:  # the ball moves away, wait at the middle
+            return model.height / 2
+        return y + self._error
+
+
+class AIInput:
+    """
+    Input source in which computer players control some of the paddles.
+    The paddles without a computer player are controlled by 'other'.
+    """
+
+    def __init__(
+        self,
+        left: PaddleAI | None = None,
+        right: PaddleAI | None = None,
+        other=None,
+    ) -> None:
+        self.left = left
+        self.right = right
+        self.other = other
+
+    def read(self, model: GameModel) -> tuple[int, int]:
+        left, right = self.other.read(model) if self.other else (0, 0)
+        if self.left is not None:
+            left = self.left.direction(model)
+        if self.right is not None:
+            right = self.right.direction(model)
+        return left, right
+
+
+def arena_directions(arena: ArenaModel) -> list[int]:
+    """Returns the direction of every paddle of 'arena': along its axis,
+    towards the nearest ball coming to it"""
+    directions = []
+    for paddle in arena.paddles:
+        cx, cy = paddle.x + paddle.width / 2, paddle.y + paddle.height / 2
+        vertical = paddle.height >= paddle.width
+        nearest, target = None, None
+        for ball in arena.balls:
+            dx, dy = ball.x - cx, ball.y - cy
+            approaching = dx * ball.vx < 0 if vertical else dy * ball.vy < 0
+            distance = dx * dx + dy * dy
+            if approaching and (nearest is None or distance < nearest):
+                nearest, target = distance, (dy if vertical else dx)
+        if target is None or abs(target) <= PADDLE_DELTA_Y:
+            directions.append(0)
+        else:
+            directions.append(1 if target > 0 else -1)
+    return directions
@@ -0,0 +1,181 @@
+"""
+This module implements the instrumentation of the main loop: the time
+spent in every phase of a frame is stored in fixed-size ring buffers,
+from which percentiles can be computed, shown on screen or exported.
+"""
+import csv
+import json
+from array import array
+from dataclasses import asdict, dataclass
+
+# Phases of a frame of GameController.mainloop
+TICK_WAIT = "tick_wait"  # waiting for the frame rate limit
+PROCESS_MODEL = "process_model"
+PROCESS_USER_INPUT = "process_user_input"
+RENDER_VIEW = "render_view"  # drawing the scene
+UPDATE = "update"  # sending the frame to the display
+CHECK_IF_QUIT = "check_if_quit"
+FRAME = "frame"  # whole frame
+PHASES = (
+    TICK_WAIT,
+    PROCESS_MODEL,
+    PROCESS_USER_INPUT,
+    RENDER_VIEW,
+    UPDATE,
+    CHECK_IF_QUIT,
+    FRAME,
+)
+
+FRAMES_KEPT = 600  # frames kept in the ring buffers (10 s at 60 FPS)
+
+
+@dataclass
+class PhaseStats:
+    """Statistics of a phase over the frames kept, in milliseconds, except
+    'worst' which covers every frame measured"""
+
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+    worst: float
+
+
+@dataclass
+class TickMetrics:
+    """Time spent stepping a match"""
+
+    ticks: int = 0
+    total_time: float = 0.0  # seconds
+    max_time: float = 0.0  # seconds
+
+    def add(self, elapsed: float) -> None:
+        self.ticks += 1
+        self.total_time += elapsed
+        if elapsed > self.max_time:
+            self.max_time = elapsed
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.ticks if self.ticks else 0.0
+
+
+class FrameProfiler:
+    """
+    Measures the time spent in every phase of the frames.
+
+    The time of a phase is accumulated with 'add' during a frame (a phase
+    can run several times per frame, e.g. several simulation ticks) and
+    stored when the frame ends.
+
+    Attributes:
+        capacity (int) : number of frames kept
+        frames (int) : number of frames measured
+        samples (dict[str, array]) : ring buffer of times of every phase, in seconds
+        worst (dict[str, float]) : longest time of every phase in all the
+            frames measured, in seconds
+    """
+
+    def __init__(self, capacity: int = FRAMES_KEPT) -> None:
+        self.capacity = capacity
+        self.frames = 0
+        self.samples = {phase: array("d", bytes(8 * capacity)) for phase in PHASES}
+        self.worst = dict.fromkeys(PHASES, 0.0)
+        self.current = dict.fromkeys(PHASES, 0.0)
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Adds 'seconds' to the time of 'phase' in the current frame"""
+        self.current[phase] += seconds
+
+    def end_frame(self, frame_time: float) -> None:
+        """Stores the times of the current frame, that took 'frame_time' seconds"""
+        self.current[FRAME] = frame_time
+        slot = self.frames % self.capacity
+        worst = self.worst
+        for phase, seconds in self.current.items():
+            self.samples[phase][slot] = seconds
+            if seconds > worst[phase]:
+                worst[phase] = seconds
+            self.current[phase] = 0.0
+        self.frames += 1
+
+    def stats(self) -> dict[str, PhaseStats]:
+        """Returns the statistics of every phase over the frames kept"""
+        count = min(self.frames, self.capacity)
+        return {
+            phase: _stats(samples[:count], self.worst[phase])
+            for phase, samples in self.samples.items()
+        }
+
+    def dump(self, path: str) -> None:
+        """Writes the statistics to 'path', as CSV if its extension is
+        '.csv' and as JSON otherwise"""
+        stats = self.stats()
+        if path.endswith(".csv"):
+            with open(path, "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(["phase", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "worst_ms"])
+                for phase, phase_stats in stats.items():
+                    writer.writerow([phase, *asdict(phase_stats).values()])
+        else:
+            with open(path, "w") as file:
+                json.dump(
+                    {
+                        "frames": self.frames,
+                        "phases_ms": {phase: asdict(s) for phase, s in stats.items()},
+                    },
+                    file,
+                    indent=2,
+                )
+
+
+class LatencyRecorder:
+    """
+    Ring buffer of the input-to-display latencies: the time from the
+    moment a key event is polled to the moment the first frame showing
+    its effect is sent to the display.
+
+    Attributes:
+        capacity (int) : number of latencies kept
+        count (int) : number of latencies measured
+        samples (array) : ring buffer of latencies, in seconds
+        worst (float) : longest latency measured, in seconds
+    """
+
+    def __init__(self, capacity: int = FRAMES_KEPT) -> None:
+        self.capacity = capacity
+        self.count = 0
+        self.samples = array("d", bytes(8 * capacity))
+        self.worst = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.samples[self.count % self.capacity] = seconds
+        self.count += 1
+        if seconds > self.worst:
+            self.worst = seconds
+
+    def stats(self) -> PhaseStats:
+        """Returns the statistics of the latencies kept"""
+        return _stats(self.samples[: min(self.count, self.capacity)], self.worst)
+
+
+def _stats(samples: array, worst: float) -> PhaseStats:
+    """Returns the statistics of 'samples' and the all-time 'worst' value,
+    given in seconds"""
+    values = sorted(samples)
+    count = len(values)
+    return PhaseStats(
+        mean=1000 * sum(values) / count if count else 0.0,
+        p50=1000 * _percentile(values, 50),
+        p95=1000 * _percentile(values, 95),
+        p99=1000 * _percentile(values, 99),
+        worst=1000 * worst,
+    )
+
+
+def _percentile(sorted_values: list[float], percent: int) -> float:
+    """Returns the nearest-rank percentile of 'sorted_values'"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, -(-percent * len(sorted_values) // 100) - 1)
+    return sorted_values[rank]
@@ -1,13 +1,44 @@
-import pygame
+from __future__ import annotations
 
-from model.game_model import GameModel
+import threading
+import time
+from copy import copy
+from dataclasses import dataclass
+from enum import Enum, auto
+from typing import TYPE_CHECKING, NamedTuple
+
+from model.game_model import GameModel, PADDLE_DELTA_Y, WIN_SCORE
 from model.ball import Ball
 from model.paddle import Paddle
 from model.player import Player
 from model.paddle_listener import setup_paddle_event_handlers
-from view.game_view import GameView
-
-from event.event import post_event, EventType
+from view.lazy import lazy_import
+from view.scene import Scene, RenderNode
+from view.sprite_atlas import SpriteAtlas, sprite_node
+from view.text_cache import TextCache
+from .frame_profiler import (
+    CHECK_IF_QUIT,
+    FRAME,
+    PROCESS_MODEL,
+    PROCESS_USER_INPUT,
+    RENDER_VIEW,
+    TICK_WAIT,
+    UPDATE,
+    FrameProfiler,
+    LatencyRecorder,
+    PhaseStats,
+    TickMetrics,
+)
+from .input_source import EventKeyboardInput, InputSource
+
+from event.event import EventBus, EventType
+
+if TYPE_CHECKING:
+    from view.game_view import GameView
+
+# pygame is only loaded when something is drawn, so the controller can run
+# headless without it
+pygame = lazy_import("pygame")
 
 # *************************************************** #
 # ****************** View Settings ****************** #
@@ -17,7 +48,7 @@ from event.event import post_event, EventType
 
 WINDOW_NAME = "Pong"  # name of the window
 WINDOW_WIDTH, WINDOW_HEIGHT = 700, 500  # size of the window
-FPS = 60  # frames per second
+FPS = 60  # maximum frames per second
 
 # ****************** Color Settings ***************** #
 
@@ -34,19 +65,143 @@ SCORE_FONT = ("comicsans", 50)
 MESSAGE_FONT = ("comicsans", 50)
 SCORE_COLOR: Color = (190, 250, 244)
 MESSAGE_COLOR: Color = (119, 245, 56)
+HUD_FONT = ("consolas", 16)
+HUD_COLOR: Color = (255, 255, 255)
+HUD_KEY = "f3"  # key that shows or hides the frame timing overlay
+HUD_REFRESH_FRAMES = 30  # frames between updates of the overlay
+
+# ***************** Timing Settings ****************** #
+
+TICK_RATE = 60  # simulation ticks per second
+TICK_TIME = 1 / TICK_RATE  # duration of a simulation tick in seconds
+MAX_FRAME_TIME = 0.25  # longest frame time simulated, to avoid a spiral of death
+SCORE_PAUSE_TICKS = TICK_RATE // 2  # pause after a score (0.5 s)
+VICTORY_PAUSE_TICKS = TICK_RATE * 2  # time the victory message is shown (2 s)
+
+# ****************** Scene Settings ****************** #
+
+ENTITIES_Z = 0  # drawing order of the ball and paddles
+SCORES_Z = 1  # drawing order of the scores
+MESSAGES_Z = 2  # drawing order of the messages
+HUD_Z = 3  # drawing order of the frame timing overlay
+
+
+@dataclass
+class RunReport:
+    """Summary of a run of the main loop"""
+
+    ticks: int  # number of simulation steps performed
+    elapsed: float  # wall time of the run in seconds
+    input_latency: PhaseStats | None = None  # None if no key event was displayed
+
+    @property
+    def steps_per_second(self) -> float:
+        return self.ticks / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        text = (
+            f"{self.ticks} steps in {self.elapsed:.3f} s "
+            f"({self.steps_per_second:,.0f} steps/s)"
+        )
+        if self.input_latency is not None:
+            text += (
+                f", input latency p50 {self.input_latency.p50:.1f} ms"
+                f" p99 {self.input_latency.p99:.1f} ms"
+            )
+        return text
+
+
+class GamePhase(Enum):
+    PLAYING = auto()  # the ball is moving
+    SCORED = auto()  # short pause after a point has been scored
+    VICTORY = auto()  # the victory message is being shown
+    OVER = auto()  # the game has finished
+
 
-# **************************************************** #
-# ****************** Model Settings ****************** #
-# **************************************************** #
+class FrameState(NamedTuple):
+    """Immutable snapshot of what is drawn, published by the simulation
+    thread after every tick when the game runs threaded"""
 
-WIN_SCORE = 5  # Score for winning the game
-PADDLE_DELTA_Y = 5 # Paddle Y speed
+    time: float  # time at which the tick finished (time.perf_counter)
+    ball_x: float
+    ball_y: float
+    left_y: int
+    right_y: int
+    left_score: int
+    right_score: int
+    phase: GamePhase
 
 
 class GameController:
-    def __init__(self, model: GameModel, view: GameView) -> None:
+    def __init__(
+        self,
+        model: GameModel,
+        view: GameView,
+        input_source: InputSource | None = None,
+        event_bus: EventBus | None = None,
+        profiler: FrameProfiler | None = None,
+        key_input: EventKeyboardInput | None = None,
+    ) -> None:
         self.model = model
         self.view = view
+        # The key events polled by the view are fed to 'key_input', which is
+        # also the input source if none is given
+        if input_source is None:
+            key_input = key_input or EventKeyboardInput()
+            input_source = key_input
+        self.input_source = input_source
+        self.key_input = key_input
+        self.input_latency = LatencyRecorder()
+        self.event_bus = event_bus or EventBus()
+        setup_paddle_event_handlers(self.event_bus)
+        self.text_cache = TextCache()
+        self.sprites = SpriteAtlas()
+        # Frame timing instrumentation, disabled if None
+        self.profiler = profiler
+        self.hud_node: RenderNode | None = None
+
+        # Game state machine
+        self.phase = GamePhase.PLAYING
+        self.pause_ticks = 0  # remaining ticks of the current pause
+        self.last_scorer: Player | None = None
+
+        # Copies of the entities drawn, interpolated between the previous
+        # and the current model state before rendering.
+        ball = model.ball
+        self.render_ball = Ball(ball.x, ball.y, ball.radius, ball.vx, ball.vy)
+        self.render_paddle_left = copy(model.player_left.paddle)
+        self.render_paddle_right = copy(model.player_right.paddle)
+        self.render_player_left = copy(model.player_left)
+        self.render_player_right = copy(model.player_right)
+        self.render_phase = self.phase
+        self.victory_node: RenderNode | None = None
+        self.previous_state = self.current_state()
+
+        # Double-buffered (previous, current) FrameStates of the threaded loop,
+        # swapped as a single reference
+        self.frame_states: tuple[FrameState, FrameState] | None = None
+        self.max_tick_lateness = 0.0  # seconds, threaded and asyncio loops only
+        self.tick_metrics = TickMetrics()  # time spent in 'step', asyncio loop only
+
+        self.scene = self.build_scene()
+
+    def build_scene(self) -> Scene:
+        """Builds the scene drawn every frame, bound to the render copies
+        of the entities and to the players"""
+        width = self.model.width
+        scene = Scene()
+        for sprite_fn in (
+            ball_sprite(self.render_ball, BALL_COLOR, self.sprites),
+            paddle_sprite(self.render_paddle_left, LEFT_PADDLE_COLOR, self.sprites),
+            paddle_sprite(self.render_paddle_right, RIGHT_PADDLE_COLOR, self.sprites),
+        ):
+            scene.add(sprite_node(sprite_fn, ENTITIES_Z))
+        for render_fn in (
+            render_score(width // 4, 20, self.render_player_left, self.text_cache),
+            render_score(width * 3 // 4, 20, self.render_player_right, self.text_cache),
+        ):
+            scene.add(RenderNode(render_fn, SCORES_Z, kind="text"))
+        return scene
 
     def process_model(self) -> Player | None:
         """Process the model and returns the Player that scored a point.
@@ -54,61 +209,402 @@ class GameController:
         return self.model.process()
 
     def process_user_input(self):
-        """Process the user inputs by posting the corresponding event"""
-        keys = pygame.key.get_pressed()
-        paddle_left = self.model.player_left.paddle
-        paddle_right = self.model.player_right.paddle
-        if keys[pygame.K_w] and self.model.in_bounds(paddle_left, -PADDLE_DELTA_Y):
-            post_event(EventType.paddle_up, paddle_left)
-        if keys[pygame.K_s] and self.model.in_bounds(paddle_left, PADDLE_DELTA_Y):
-            post_event(EventType.paddle_down, paddle_left)
-        if keys[pygame.K_UP] and self.model.in_bounds(paddle_right, -PADDLE_DELTA_Y):
-            post_event(EventType.paddle_up, paddle_right)
-        if keys[pygame.K_DOWN] and self.model.in_bounds(paddle_right, PADDLE_DELTA_Y):
-            post_event(EventType.paddle_down, paddle_right)
+        """Process the user inputs by enqueuing the corresponding events
+        and dispatching them"""
+        left, right = self.input_source.read(self.model)
+        self.enqueue_paddle_event(self.model.player_left.paddle, left)
+        self.enqueue_paddle_event(self.model.player_right.paddle, right)
+        self.event_bus.drain()
+
+    def enqueue_paddle_event(self, paddle: Paddle, direction: int) -> None:
+        """Enqueues the event that moves 'paddle' in 'direction' (-1 up, 1 down)
+        if the paddle stays inside the field"""
+        if direction < 0 and self.model.in_bounds(paddle, -PADDLE_DELTA_Y):
+            self.event_bus.enqueue(EventType.paddle_up, paddle)
+        elif direction > 0 and self.model.in_bounds(paddle, PADDLE_DELTA_Y):
+            self.event_bus.enqueue(EventType.paddle_down, paddle)
+
+    def step(self) -> None:
+        """Advances the game by one fixed simulation tick"""
+        if self.phase is GamePhase.PLAYING:
+            self.previous_state = self.current_state()
+            # The input is applied before processing the model, so a key
+            # pressed in a frame already counts in its first tick
+            if self.profiler is None:
+                self.process_user_input()
+                player = self.process_model()
+            else:
+                start = time.perf_counter()
+                self.process_user_input()
+                middle = time.perf_counter()
+                player = self.process_model()
+                self.profiler.add(PROCESS_USER_INPUT, middle - start)
+                self.profiler.add(PROCESS_MODEL, time.perf_counter() - middle)
+            if player:  # if there is a score
+                # The model has been reset, don't interpolate across it
+                self.previous_state = self.current_state()
+                self.last_scorer = player
+                self.start_pause(GamePhase.SCORED, SCORE_PAUSE_TICKS)
+            return
+
+        self.pause_ticks -= 1
+        if self.pause_ticks > 0:
+            return
+        if self.phase is GamePhase.SCORED:
+            if self.last_scorer.score >= WIN_SCORE:  # checks if player winned the game
+                self.start_pause(GamePhase.VICTORY, VICTORY_PAUSE_TICKS)
+            else:
+                self.phase = GamePhase.PLAYING
+        elif self.phase is GamePhase.VICTORY:
+            self.phase = GamePhase.OVER
+
+    def start_pause(self, phase: GamePhase, ticks: int) -> None:
+        """Enters 'phase' for 'ticks' simulation ticks"""
+        self.phase = phase
+        self.pause_ticks = ticks
+
+    def current_state(self) -> tuple[float, float, int, int]:
+        """Returns the position of the moving entities of the model"""
+        return (
+            self.model.ball.x,
+            self.model.ball.y,
+            self.model.player_left.paddle.y,
+            self.model.player_right.paddle.y,
+        )
+
+    def interpolate(self, alpha: float) -> None:
+        """Places the render copies of the entities at a fraction 'alpha'
+        of the way between the previous and the current model state"""
+        x0, y0, left0, right0 = self.previous_state
+        x1, y1, left1, right1 = self.current_state()
+        self.render_ball.x = x0 + (x1 - x0) * alpha
+        self.render_ball.y = y0 + (y1 - y0) * alpha
+        self.render_paddle_left.y = left0 + (left1 - left0) * alpha
+        self.render_paddle_right.y = right0 + (right1 - right0) * alpha
+        self.render_player_left.score = self.model.player_left.score
+        self.render_player_right.score = self.model.player_right.score
+        self.render_phase = self.phase
+
+    def update_scene(self) -> None:
+        """Adds the victory message to the scene once it has to be shown"""
+        if self.render_phase is GamePhase.VICTORY and self.victory_node is None:
+            self.victory_node = self.scene.add(
+                RenderNode(
+                    render_victory(
+                        self.model.width,
+                        self.model.height,
+                        self.last_scorer,
+                        self.text_cache,
+                    ),
+                    MESSAGES_Z,
+                    kind="text",
+                )
+            )
 
     def render_view(self) -> None:
         """Renders the view."""
-        render_fns = (
-            render_background(BACKGROUND_COLOR),
-            render_mid_line(self.model.width, self.model.height, MID_LINE_COLOR),
-            render_ball(self.model.ball, BALL_COLOR),
-            render_paddle(self.model.player_left.paddle, LEFT_PADDLE_COLOR),
-            render_paddle(self.model.player_right.paddle, RIGHT_PADDLE_COLOR),
-            render_score(self.model.width // 4, 20, self.model.player_left),
-            render_score(self.model.width * 3 // 4, 20, self.model.player_right),
-        )
-        self.view.render(*render_fns)
+        self.update_scene()
+        self.view.clear()
+        self.view.render_scene(self.scene)
         self.view.update()
 
-    def render_victory_view(self, player: Player):
-        """Renders the victory screen"""
-        self.view.render(render_victory(self.model.width, self.model.height, player))
+    def profiled_render_view(self) -> None:
+        """Renders the view, measuring the drawing and the display update"""
+        profiler = self.profiler
+        start = time.perf_counter()
+        self.update_scene()
+        self.view.clear()
+        self.view.render_scene(self.scene)
+        rendered = time.perf_counter()
         self.view.update()
-
-    def mainloop(self) -> None:
-        """Game's main loop"""
-        run = True
-        setup_paddle_event_handlers()
+        profiler.add(RENDER_VIEW, rendered - start)
+        profiler.add(UPDATE, time.perf_counter() - rendered)
+
+    def poll_events(self) -> bool:
+        """Polls the events of the view and feeds the key events to the
+        key input. Returns True if the game has been quit."""
+        quit = self.view.check_if_quit()
+        if self.key_input is not None and self.view.key_events:
+            self.key_input.handle_key_events(self.view.key_events)
+        if self.profiler is not None and HUD_KEY in self.view.key_presses:
+            self.toggle_hud()
+        return quit
+
+    def record_input_latency(self) -> None:
+        """Records the latency of the key events applied since the last
+        frame, right after the frame showing them has been displayed"""
+        if self.key_input is None:
+            return
+        input_time = self.key_input.take_input_time()
+        if input_time is not None:
+            self.input_latency.add(time.perf_counter() - input_time)
+
+    def report(self, ticks: int, elapsed: float) -> RunReport:
+        """Returns the report of a run of 'ticks' steps in 'elapsed' seconds"""
+        latency = self.input_latency.stats() if self.input_latency.count else None
+        return RunReport(ticks, elapsed, latency)
+
+    def toggle_hud(self) -> None:
+        """Shows or hides the frame timing overlay"""
+        if self.hud_node is None:
+            self.hud_node = self.scene.add(
+                RenderNode(
+                    render_profiler_hud(10, 10, self.profiler, self.text_cache),
+                    HUD_Z,
+                    kind="text",
+                )
+            )
+        else:
+            self.hud_node.visible = not self.hud_node.visible
+
+    def mainloop(
+        self, max_ticks: int | None = None, profile_path: str | None = None
+    ) -> RunReport:
+        """Game's main loop. Runs until a player wins, the window is closed
+        or 'max_ticks' simulation steps have been performed.
+        Returns a report of the run. If the controller has a profiler, its
+        statistics are written to 'profile_path' at the end.
+
+        The simulation advances in fixed ticks of 1 / TICK_RATE seconds,
+        as many as the elapsed time requires, so the game speed doesn't
+        depend on the frame rate. A headless view performs one tick per
+        frame without waiting, and shows the state of that tick.
+
+        The events are polled at the start of every frame, right before
+        the ticks that apply them, and the input-to-display latency of the
+        key events is recorded once their frame has been displayed."""
+        ticks = 0
+        accumulator = 0.0
         self.view.setup(WINDOW_NAME, WINDOW_WIDTH, WINDOW_HEIGHT)
-        while run:
+        self.view.set_background(
+            render_background(BACKGROUND_COLOR),
+            render_mid_line(self.model.width, self.model.height, MID_LINE_COLOR),
+        )
+        profiler = self.profiler
+        start = previous_time = time.perf_counter()
+        while self.phase is not GamePhase.OVER and ticks != max_ticks:
+            if profiler is not None:
+                frame_start = time.perf_counter()
             self.view.tick(FPS)
-            player = self.process_model()
-            self.process_user_input()
+            if profiler is None:
+                quit = self.poll_events()
+            else:
+                polling_start = time.perf_counter()
+                quit = self.poll_events()
+                profiler.add(TICK_WAIT, polling_start - frame_start)
+                profiler.add(CHECK_IF_QUIT, time.perf_counter() - polling_start)
+            if quit:
+                break
+
+            if self.view.headless:
+                accumulator = TICK_TIME
+            else:
+                now = time.perf_counter()
+                accumulator += min(now - previous_time, MAX_FRAME_TIME)
+                previous_time = now
+
+            while accumulator >= TICK_TIME and ticks != max_ticks:
+                self.step()
+                accumulator -= TICK_TIME
+                ticks += 1
+
+            # a headless frame follows its tick at once: show that tick
+            self.interpolate(1.0 if self.view.headless else accumulator / TICK_TIME)
+            if profiler is None:
+                self.render_view()
+            else:
+                self.profiled_render_view()
+                profiler.end_frame(time.perf_counter() - frame_start)
+            self.record_input_latency()
+
+        report = self.report(ticks, time.perf_counter() - start)
+        self.view.quit()
+        if profiler is not None and profile_path:
+            profiler.dump(profile_path)
+        return report
+
+    # ************************ Asyncio loop ************************* #
+
+    async def mainloop_async(self, max_ticks: int | None = None) -> RunReport:
+        """Awaitable variant of 'mainloop', so many controllers can share
+        an asyncio event loop with other tasks. Instead of blocking in the
+        view's frame rate limit, every frame awaits until the next one is
+        due; the score pauses and the victory message are counted in ticks,
+        so nothing else blocks. A headless view runs one tick per frame and
+        only yields to the event loop between frames.
+
+        The time spent in every tick is kept in self.tick_metrics and the
+        worst frame lateness in self.max_tick_lateness. pygame has a single
+        window, so only one of the controllers can be windowed."""
+        import asyncio  # only loaded here, it's slow to import for headless workers
+
+        ticks = 0
+        accumulator = 0.0
+        frame_time = 1 / FPS
+        self.view.setup(WINDOW_NAME, WINDOW_WIDTH, WINDOW_HEIGHT)
+        self.view.set_background(
+            render_background(BACKGROUND_COLOR),
+            render_mid_line(self.model.width, self.model.height, MID_LINE_COLOR),
+        )
+        metrics = self.tick_metrics
+        start = previous_time = deadline = time.perf_counter()
+        while self.phase is not GamePhase.OVER and ticks != max_ticks:
+            if self.poll_events():
+                break
+
+            if self.view.headless:
+                accumulator = TICK_TIME
+            else:
+                now = time.perf_counter()
+                accumulator += min(now - previous_time, MAX_FRAME_TIME)
+                previous_time = now
+
+            while accumulator >= TICK_TIME and ticks != max_ticks:
+                tick_start = time.perf_counter()
+                self.step()
+                metrics.add(time.perf_counter() - tick_start)
+                accumulator -= TICK_TIME
+                ticks += 1
+
+            # a headless frame follows its tick at once: show that tick
+            self.interpolate(1.0 if self.view.headless else accumulator / TICK_TIME)
             self.render_view()
+            self.record_input_latency()
 
-            # Handle score
-            if player:  # if there is a score
-                pygame.time.delay(500)
-                if player.score >= WIN_SCORE:  # checks if player winned the game
-                    self.render_victory_view(player)
-                    pygame.time.delay(2000)
-                    break
+            if self.view.headless:
+                await asyncio.sleep(0)
+                continue
+            deadline += frame_time
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            if -delay > self.max_tick_lateness:
+                self.max_tick_lateness = -delay
+            if -delay > MAX_FRAME_TIME:  # too far behind, don't try to catch up
+                deadline = time.perf_counter()
+            await asyncio.sleep(0)
 
-            if self.view.check_if_quit():
-                run = False
+        report = self.report(ticks, time.perf_counter() - start)
+        self.view.quit()
+        return report
+
+    # ************************ Threaded loop ************************ #
+
+    def mainloop_threaded(self, max_ticks: int | None = None) -> RunReport:
+        """Variant of 'mainloop' that runs the simulation at a fixed rate on
+        its own thread, so a slow frame doesn't delay the ticks. After every
+        tick the simulation thread publishes an immutable FrameState, and
+        the rendering (on the calling thread, as pygame requires) draws
+        from the two latest ones. A headless view doesn't pace the
+        simulation, which runs as fast as possible.
+
+        The events are polled on the calling thread too, and the key events
+        are handed to the simulation thread through the key input, so
+        pygame is never used by the simulation thread. An exception raised
+        by the simulation thread stops the loop and is raised again here."""
+        self.view.setup(WINDOW_NAME, WINDOW_WIDTH, WINDOW_HEIGHT)
+        self.view.set_background(
+            render_background(BACKGROUND_COLOR),
+            render_mid_line(self.model.width, self.model.height, MID_LINE_COLOR),
+        )
+        state = self.frame_state()
+        self.frame_states = (state, state)
+        stop = threading.Event()
+        ticks = [0]  # written by the simulation thread
+        errors: list[BaseException] = []  # exception of the simulation thread
+        simulation = threading.Thread(
+            target=self._simulate, args=(stop, max_ticks, ticks, errors), daemon=True
+        )
+        start = time.perf_counter()
+        simulation.start()
+        while not stop.is_set():
+            self.view.tick(FPS)
+            if self.view.headless:  # nothing to draw, don't compete for the GIL
+                stop.wait(TICK_TIME)
+            if self.poll_events():
+                stop.set()
+                break
+            previous, current = self.frame_states
+            if self.view.headless:
+                alpha = 1.0
+            else:
+                alpha = min((time.perf_counter() - current.time) / TICK_TIME, 1.0)
+            self.apply_frame_states(previous, current, alpha)
+            self.render_view()
+            self.record_input_latency()
+        simulation.join()
 
+        report = self.report(ticks[0], time.perf_counter() - start)
         self.view.quit()
+        if errors:
+            raise errors[0]
+        return report
+
+    def _simulate(
+        self,
+        stop: threading.Event,
+        max_ticks: int | None,
+        ticks: list[int],
+        errors: list[BaseException],
+    ) -> None:
+        """Body of the simulation thread"""
+        paced = not self.view.headless
+        deadline = time.perf_counter()
+        try:
+            while not stop.is_set() and self.phase is not GamePhase.OVER and ticks[0] != max_ticks:
+                if paced:
+                    lateness = time.perf_counter() - deadline
+                    if lateness > self.max_tick_lateness:
+                        self.max_tick_lateness = lateness
+                self.step()
+                ticks[0] += 1
+                # Atomic swap of the double buffer
+                self.frame_states = (self.frame_states[1], self.frame_state())
+                if not paced:
+                    continue
+
+                deadline += TICK_TIME
+                delay = deadline - time.perf_counter()
+                if delay > 0:
+                    stop.wait(delay)
+                elif delay < -MAX_FRAME_TIME:  # too far behind, drop the missed ticks
+                    deadline = time.perf_counter()
+        except BaseException as error:
+            errors.append(error)
+        finally:
+            stop.set()
+
+    def frame_state(self) -> FrameState:
+        """Returns a snapshot of what is drawn"""
+        model = self.model
+        return FrameState(
+            time.perf_counter(),
+            model.ball.x,
+            model.ball.y,
+            model.player_left.paddle.y,
+            model.player_right.paddle.y,
+            model.player_left.score,
+            model.player_right.score,
+            self.phase,
+        )
+
+    def apply_frame_states(
+        self, previous: FrameState, current: FrameState, alpha: float
+    ) -> None:
+        """Places the render copies of the entities at a fraction 'alpha'
+        of the way between two published FrameStates"""
+        if current.left_score != previous.left_score or current.right_score != previous.right_score:
+            previous = current  # the model has been reset, don't interpolate across it
+        self.render_ball.x = previous.ball_x + (current.ball_x - previous.ball_x) * alpha
+        self.render_ball.y = previous.ball_y + (current.ball_y - previous.ball_y) * alpha
+        self.render_paddle_left.y = previous.left_y + (current.left_y - previous.left_y) * alpha
+        self.render_paddle_right.y = (
+            previous.right_y + (current.right_y - previous.right_y) * alpha
+        )
+        self.render_player_left.score = current.left_score
+        self.render_player_right.score = current.right_score
+        self.render_phase = current.phase
 
 
 # ****************************************************************** #
@@ -144,8 +640,8 @@ def render_mid_line(field_width: int, field_height: int, color: Color):
 def render_ball(ball: Ball, color: Color):
     """Returns a function that renders the ball"""
 
-    def render(window: pygame.Surface) -> None:
-        pygame.draw.circle(
+    def render(window: pygame.Surface) -> pygame.Rect:
+        return pygame.draw.circle(
             window,
             color,
             (ball.x, ball.y),
@@ -158,8 +654,8 @@ def render_ball(ball: Ball, color: Color):
 def render_paddle(paddle: Paddle, color: Color):
     """Returns a function that renders a paddle"""
 
-    def render(window: pygame.Surface) -> None:
-        pygame.draw.rect(
+    def render(window: pygame.Surface) -> pygame.Rect:
+        return pygame.draw.rect(
             window,
             color,
             (paddle.x, paddle.y, paddle.width, paddle.height),
@@ -168,18 +664,42 @@ def render_paddle(paddle: Paddle, color: Color):
     return render
 
 
-def render_score(x_loc: int, y_loc: int, player: Player):
+def ball_sprite(ball: Ball, color: Color, atlas: SpriteAtlas):
+    """Returns a function that gives the sprite of the ball and its
+    position, drawing the same pixels as 'render_ball'"""
+
+    def sprite(window: pygame.Surface):
+        # pygame.draw.circle truncates the center towards zero
+        radius = ball.radius
+        return atlas.circle(window, radius, color), (int(ball.x) - radius, int(ball.y) - radius)
+
+    return sprite
+
+
+def paddle_sprite(paddle: Paddle, color: Color, atlas: SpriteAtlas):
+    """Returns a function that gives the sprite of a paddle and its
+    position, drawing the same pixels as 'render_paddle'"""
+
+    def sprite(window: pygame.Surface):
+        return atlas.rect(window, paddle.width, paddle.height, color), (
+            int(paddle.x),
+            int(paddle.y),
+        )
+
+    return sprite
+
+
+def render_score(x_loc: int, y_loc: int, player: Player, text_cache: TextCache):
     """Returns a function that renders the player score at location
     '(x_loc, y_loc)'"""
 
-    def render(window: pygame.Surface):
-        font = pygame.font.SysFont(*SCORE_FONT)
-        text = font.render(
+    def render(window: pygame.Surface) -> pygame.Rect:
+        text = text_cache.render(
             f"{player.score}",
-            True,
+            SCORE_FONT,
             SCORE_COLOR,
         )
-        window.blit(
+        return window.blit(
             text,
             (x_loc - text.get_width() // 2, y_loc),
         )
@@ -187,17 +707,18 @@ def render_score(x_loc: int, y_loc: int, player: Player):
     return render
 
 
-def render_victory(field_width: int, field_height: int, player: Player):
+def render_victory(
+    field_width: int, field_height: int, player: Player, text_cache: TextCache
+):
     """Returns a function that renders a victory message on the screen"""
 
-    def render(window: pygame.Surface) -> None:
-        font = pygame.font.SysFont(*MESSAGE_FONT)
-        text = font.render(
+    def render(window: pygame.Surface) -> pygame.Rect:
+        text = text_cache.render(
             f"{player.name.capitalize()} Won!",
-            True,
+            MESSAGE_FONT,
             MESSAGE_COLOR,
         )
-        window.blit(
+        return window.blit(
             text,
             (
                 field_width // 2 - text.get_width() // 2,
@@ -206,3 +727,30 @@ def render_victory(field_width: int, field_height: int, player: Player):
         )
 
     return render
+
+
+def render_profiler_hud(
+    x_loc: int, y_loc: int, profiler: FrameProfiler, text_cache: TextCache
+):
+    """Returns a function that renders the frame timing statistics at
+    location '(x_loc, y_loc)'"""
+    lines: list[str] = []
+    refreshed_at = -HUD_REFRESH_FRAMES
+
+    def render(window: pygame.Surface) -> pygame.Rect:
+        nonlocal refreshed_at
+        if profiler.frames - refreshed_at >= HUD_REFRESH_FRAMES:
+            refreshed_at = profiler.frames
+            lines[:] = [
+                f"{phase:<18} p50 {s.p50:6.2f}  p99 {s.p99:6.2f}  max {s.worst:6.2f} ms"
+                for phase, s in profiler.stats().items()
+            ]
+        area = pygame.Rect(x_loc, y_loc, 0, 0)
+        y = y_loc
+        for line in lines:
+            text = text_cache.render(line, HUD_FONT, HUD_COLOR)
+            area.union_ip(window.blit(text, (x_loc, y)))
+            y += text.get_height()
+        return area
+
+    return render
@@ -0,0 +1,130 @@
+"""
+This module implements the sources the GameController reads the paddle
+inputs from. An input source returns, every tick, the direction in which
+each paddle wants to move: -1 (up), 0 (still) or 1 (down).
+"""
+import threading
+from itertools import cycle
+from typing import Iterable, Protocol
+
+from model.game_model import GameModel
+from view.lazy import lazy_import
+
+pygame = lazy_import("pygame")
+
+# Direction of the left and right paddles
+PaddleInput = tuple[int, int]
+# Key event gathered by the view: (key name, pressed, time.perf_counter()
+# when it was polled)
+KeyEvent = tuple[str, bool, float]
+
+# Names (pygame.key.name) of the keys that move each paddle up and down
+LEFT_KEYS = ("w", "s")
+RIGHT_KEYS = ("up", "down")
+PADDLE_KEYS = frozenset(LEFT_KEYS + RIGHT_KEYS)
+
+
+class InputSource(Protocol):
+    def read(self, model: GameModel) -> PaddleInput:
+        """Returns the direction of the left and right paddles"""
+
+
+class KeyboardInput:
+    """Reads the paddle inputs from the keyboard ('w'/'s' for the left
+    paddle, up/down arrows for the right paddle). pygame only allows it on
+    the main thread: the threaded loop needs an EventKeyboardInput."""
+
+    def read(self, model: GameModel) -> PaddleInput:
+        if threading.current_thread() is not threading.main_thread():
+            raise RuntimeError("KeyboardInput can only be read on the main thread")
+        keys = pygame.key.get_pressed()
+        return (
+            keys[pygame.K_s] - keys[pygame.K_w],
+            keys[pygame.K_DOWN] - keys[pygame.K_UP],
+        )
+
+
+class EventKeyboardInput:
+    """
+    Reads the paddle inputs from the key events gathered by the view, with
+    the same keys as KeyboardInput.
+
+    A key is held from its KEYDOWN to its KEYUP, and a key pressed since
+    the previous tick is latched, so a tap shorter than a tick still moves
+    its paddle for one tick. The time of the oldest event applied by
+    'read' is kept until 'take_input_time' to measure the input-to-display
+    latency. The events can be handled on another thread than the one
+    that reads the input.
+    """
+
+    def __init__(self) -> None:
+        self.held: set[str] = set()  # keys currently held down
+        self.taps: set[str] = set()  # keys pressed since the last read
+        self.pending_time: float | None = None  # oldest event not read yet
+        self.applied_time: float | None = None  # oldest event read, not displayed yet
+        self.lock = threading.Lock()
+
+    def handle_key_events(self, events: Iterable[KeyEvent]) -> None:
+        """Updates the keys held with 'events'"""
+        with self.lock:
+            for name, pressed, timestamp in events:
+                if name not in PADDLE_KEYS:
+                    continue
+                if pressed:
+                    self.held.add(name)
+                    self.taps.add(name)
+                else:
+                    self.held.discard(name)
+                if self.pending_time is None:
+                    self.pending_time = timestamp
+
+    def read(self, model: GameModel) -> PaddleInput:
+        with self.lock:
+            keys = self.held | self.taps
+            self.taps.clear()
+            if self.pending_time is not None:
+                if self.applied_time is None:
+                    self.applied_time = self.pending_time
+                self.pending_time = None
+        return (
+            (LEFT_KEYS[1] in keys) - (LEFT_KEYS[0] in keys),
+            (RIGHT_KEYS[1] in keys) - (RIGHT_KEYS[0] in keys),
+        )
+
+    def take_input_time(self) -> float | None:
+        """Returns the time of the oldest key event applied since the last
+        call, None if there isn't any"""
+        with self.lock:
+            applied_time, self.applied_time = self.applied_time, None
+        return applied_time
+
+
+class ScriptedInput:
+    """Replays a fixed sequence of paddle inputs over and over"""
+
+    def __init__(self, inputs: Iterable[PaddleInput]) -> None:
+        self.inputs = cycle(tuple(inputs))
+
+    def read(self, model: GameModel) -> PaddleInput:
+        return next(self.inputs)
+
+
+class BallTrackingInput:
+    """Moves both paddles towards the 'y' coordinate of the ball"""
+
+    def read(self, model: GameModel) -> PaddleInput:
+        return (
+            _track(model.ball.y, model.player_left.paddle.y, model.player_left.paddle.height),
+            _track(model.ball.y, model.player_right.paddle.y, model.player_right.paddle.height),
+        )
+
+
+def _track(target_y: float, paddle_y: int, paddle_height: int) -> int:
+    """Returns the direction that brings the center of the paddle closer
+    to 'target_y'"""
+    center = paddle_y + paddle_height / 2
+    if target_y < center - paddle_height / 4:
+        return -1
+    if target_y > center + paddle_height / 4:
+        return 1
+    return 0
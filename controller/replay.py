@@ -0,0 +1,230 @@
+"""
+This module implements the recording and replay of matches.
+
+A replay file stores the paddle inputs read in every tick of a match,
+two signed bytes per tick, together with the initial state of the model
+and a keyframe (a model snapshot, see model.state) every
+'keyframe_interval' ticks. Replaying a file feeds the inputs back to a
+GameModel headlessly, and keyframes allow seeking to any tick without
+simulating the match from the beginning.
+
+File layout (little endian):
+    header      : see HEADER
+    initial     : STATE_SIZE doubles
+    inputs      : tick_count * 2 signed bytes (left, right)
+    keyframes   : keyframe_count * STATE_SIZE doubles
+"""
+import mmap
+import struct
+from array import array
+
+from model.game_model import GameModel, PADDLE_DELTA_Y
+from model.paddle import Paddle
+from model.state import STATE_SIZE, new_state, restore, snapshot
+
+MAGIC = b"PONGREPL"
+VERSION = 2  # 2: the input of a tick is applied before processing the model
+# magic, version, flags, width, height, keyframe interval, ticks, keyframes
+HEADER = struct.Struct("<8sHHHHIII")
+FLAG_CONTINUOUS_COLLISION = 1
+FLAG_FIXED_POINT = 2
+KEYFRAME_INTERVAL = 600  # ticks between keyframes (10 s at 60 ticks/s)
+
+
+class ReplayError(Exception):
+    """Raised when a replay file can't be read"""
+
+
+def apply_input(model: GameModel, left: int, right: int) -> None:
+    """Moves the paddles of 'model' like the paddle events posted by the
+    GameController for the directions 'left' and 'right'"""
+    move_paddle(model, model.player_left.paddle, left)
+    move_paddle(model, model.player_right.paddle, right)
+
+
+def move_paddle(model: GameModel, paddle: Paddle, direction: int) -> None:
+    if direction < 0 and model.in_bounds(paddle, -PADDLE_DELTA_Y):
+        paddle.move(-PADDLE_DELTA_Y)
+    elif direction > 0 and model.in_bounds(paddle, PADDLE_DELTA_Y):
+        paddle.move(PADDLE_DELTA_Y)
+
+
+# ****************************************************************** #
+# *************************** Recording **************************** #
+# ****************************************************************** #
+
+
+class RecordingInput:
+    """
+    Input source that records the inputs read from another input source.
+
+    Every call to 'read' is one tick of the match: the GameController reads
+    the input right before processing the model, so the keyframe of a tick
+    is the state of the model after all the previous ticks.
+    """
+
+    def __init__(
+        self,
+        source,
+        model: GameModel,
+        keyframe_interval: int = KEYFRAME_INTERVAL,
+    ) -> None:
+        self.source = source
+        self.model = model
+        self.keyframe_interval = keyframe_interval
+        self.initial_state = model.snapshot()
+        self.inputs = bytearray()
+        self.keyframes = array("d")
+        self.keyframe = new_state()
+        self.tick = 0
+
+    def read(self, model: GameModel) -> tuple[int, int]:
+        if self.tick % self.keyframe_interval == 0:
+            snapshot(model, self.keyframe)
+            self.keyframes.extend(self.keyframe)
+        left, right = self.source.read(model)
+        self.inputs += bytes((left & 0xFF, right & 0xFF))
+        self.tick += 1
+        return left, right
+
+    def save(self, path: str) -> None:
+        """Writes the recorded match to 'path'"""
+        flags = 0
+        if self.model.continuous_collision:
+            flags |= FLAG_CONTINUOUS_COLLISION
+        if self.model.fixed_point:
+            flags |= FLAG_FIXED_POINT
+        header = HEADER.pack(
+            MAGIC,
+            VERSION,
+            flags,
+            self.model.width,
+            self.model.height,
+            self.keyframe_interval,
+            self.tick,
+            len(self.keyframes) // STATE_SIZE,
+        )
+        with open(path, "wb") as file:
+            file.write(header)
+            file.write(self.initial_state)
+            file.write(self.inputs)
+            file.write(self.keyframes)
+
+
+# ****************************************************************** #
+# ***************************** Replay ***************************** #
+# ****************************************************************** #
+
+
+class Replay:
+    """
+    Memory-mapped replay file.
+
+    Attributes:
+        model (GameModel) : model the match is replayed on
+        tick (int) : number of ticks replayed so far
+        tick_count (int) : number of ticks of the match
+        inputs (memoryview) : signed bytes of the inputs, two per tick,
+            read directly from the mapped file
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as file:
+            self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._parse()
+        except (ReplayError, struct.error, ValueError):
+            self.close()
+            raise
+
+    def _parse(self) -> None:
+        (
+            magic,
+            version,
+            flags,
+            width,
+            height,
+            self.keyframe_interval,
+            self.tick_count,
+            keyframe_count,
+        ) = HEADER.unpack_from(self.mmap)
+        if magic != MAGIC:
+            raise ReplayError("not a replay file")
+        if version != VERSION:
+            raise ReplayError(f"unsupported replay version {version}")
+
+        view = self._view = memoryview(self.mmap)
+        state_bytes = 8 * STATE_SIZE
+        start = HEADER.size
+        self.initial_state = view[start : start + state_bytes].cast("d")
+        start += state_bytes
+        self.inputs = view[start : start + 2 * self.tick_count].cast("b")
+        start += 2 * self.tick_count
+        self.keyframes = view[start : start + keyframe_count * state_bytes].cast("d")
+        if len(self.keyframes) != keyframe_count * STATE_SIZE:
+            raise ReplayError("truncated replay file")
+
+        self.model = GameModel(
+            width,
+            height,
+            continuous_collision=bool(flags & FLAG_CONTINUOUS_COLLISION),
+            fixed_point=bool(flags & FLAG_FIXED_POINT),
+        )
+        self.reset()
+
+    def reset(self) -> None:
+        """Goes back to the beginning of the match"""
+        restore(self.model, self.initial_state)
+        self.tick = 0
+
+    def step(self) -> bool:
+        """Replays one tick. Returns False if the match has ended."""
+        if self.tick >= self.tick_count:
+            return False
+        apply_input(self.model, self.inputs[2 * self.tick], self.inputs[2 * self.tick + 1])
+        self.model.process()
+        self.tick += 1
+        return True
+
+    def run(self, until: int | None = None) -> None:
+        """Replays the match, as fast as possible, until tick 'until' or
+        until the end of the match"""
+        end = self.tick_count if until is None else min(until, self.tick_count)
+        model, inputs = self.model, self.inputs
+        for tick in range(self.tick, end):
+            apply_input(model, inputs[2 * tick], inputs[2 * tick + 1])
+            model.process()
+        self.tick = max(self.tick, end)
+
+    def seek(self, tick: int) -> None:
+        """Sets the model to its state after 'tick' ticks, starting from
+        the closest keyframe"""
+        tick = max(0, min(tick, self.tick_count))
+        keyframe = min(tick // self.keyframe_interval, len(self.keyframes) // STATE_SIZE - 1)
+        keyframe_tick = keyframe * self.keyframe_interval
+        if keyframe_tick <= self.tick <= tick:
+            # replaying forward from the current tick is the shortest path
+            self.run(tick)
+            return
+        if keyframe < 0:
+            self.reset()
+            self.run(tick)
+            return
+
+        # The keyframe of a tick is the state before its input is applied
+        restore(self.model, self.keyframes, keyframe * STATE_SIZE)
+        self.tick = keyframe_tick
+        self.run(tick)
+
+    def close(self) -> None:
+        for name in ("initial_state", "inputs", "keyframes", "_view"):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        self.mmap.close()
+
+    def __enter__(self) -> "Replay":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,183 @@
+"""
+This module implements a Gym-style vectorized environment to train
+agents against the game. It steps N matches at once with BatchGameModel
+and writes observations, rewards and done flags into preallocated NumPy
+arrays that are reused by every step.
+"""
+import numpy as np
+
+from model.batch_model import BatchGameModel
+from model.game_model import PADDLE_DELTA_Y, PADDLE_WIDTH, WIN_SCORE
+
+# Layout of a state observation
+OBS_BALL_X, OBS_BALL_Y, OBS_BALL_VX, OBS_BALL_VY, OBS_LEFT_Y, OBS_RIGHT_Y = range(6)
+OBS_SIZE = 6
+
+PIXEL_SCALE = 4  # the pixel observations are 'PIXEL_SCALE' times smaller than the field
+
+
+class PongVectorEnv:
+    """
+    'num_envs' independent matches stepped together.
+
+    Every step takes the direction (-1 up, 0 still, 1 down) of the left and
+    right paddles of every match. The reward is +1 when the left player
+    scores and -1 when the right player does (the right player's reward is
+    its opposite). A match is done when a player reaches WIN_SCORE and is
+    then reset automatically: the observations returned are those of the
+    new match, and the last ones of the finished match are given in
+    infos["final_observation"], with infos["_final_observation"] telling
+    which matches finished (the keys are only present on those steps).
+
+    The arrays returned are reused: the next step overwrites them.
+
+    Attributes:
+        observations (np.ndarray) : (num_envs, OBS_SIZE) float32 state
+            observations, positions normalized by the size of the field;
+            or (num_envs, height, width) uint8 frames in pixel mode
+        rewards (np.ndarray) : (num_envs,) float32
+        terminations (np.ndarray) : (num_envs,) bool, a player has won
+        truncations (np.ndarray) : (num_envs,) bool, always False
+        final_observations (np.ndarray) : last observations of the matches
+            finished in the last step, same shape as 'observations'
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        width: int = 700,
+        height: int = 500,
+        pixels: bool = False,
+        pixel_scale: int = PIXEL_SCALE,
+    ) -> None:
+        self.num_envs = num_envs
+        self.model = BatchGameModel(num_envs, width, height)
+        self.pixels = pixels
+
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.terminations = np.zeros(num_envs, dtype=np.bool_)
+        self.truncations = np.zeros(num_envs, dtype=np.bool_)
+        self.infos: dict = {}
+        self._actions = np.zeros((num_envs, 2), dtype=np.int64)
+        self._left_dy = np.zeros(num_envs, dtype=np.int64)
+        self._right_dy = np.zeros(num_envs, dtype=np.int64)
+        self._won = np.zeros(num_envs, dtype=np.bool_)
+        self._column = np.zeros(num_envs, dtype=np.float64)
+
+        if pixels:
+            self._renderer = _PixelRenderer(self.model, pixel_scale)
+            self.observations = self._renderer.frames
+        else:
+            self._renderer = None
+            self.observations = np.zeros((num_envs, OBS_SIZE), dtype=np.float32)
+        self.final_observations = np.zeros_like(self.observations)
+
+    def reset(self) -> np.ndarray:
+        """Resets every match and returns the observations"""
+        self.model.reset()
+        self.model.left_score[:] = 0
+        self.model.right_score[:] = 0
+        self.rewards[:] = 0
+        self.terminations[:] = False
+        self.infos.clear()
+        self._observe()
+        return self.observations
+
+    def step(self, actions: np.ndarray):
+        """Advances every match by one tick with 'actions', a (num_envs, 2)
+        array of any numeric dtype with the direction of the left and right
+        paddles: -1 (up), 0 (still) or 1 (down). Float actions are truncated
+        towards zero and every action is clipped to [-1, 1].
+        Returns (observations, rewards, terminations, truncations, infos)."""
+        model = self.model
+        directions = self._actions
+        np.copyto(directions, actions, casting="unsafe")
+        np.clip(directions, -1, 1, out=directions)
+        # same order as GameController.step: the actions before the model
+        np.multiply(directions[:, 0], PADDLE_DELTA_Y, out=self._left_dy)
+        np.multiply(directions[:, 1], PADDLE_DELTA_Y, out=self._right_dy)
+        model.move_paddles(self._left_dy, self._right_dy)
+        # the reset is deferred to observe the last state of the finished matches
+        np.copyto(self.rewards, model.process(defer_reset=True))
+
+        terminations = self.terminations
+        np.greater_equal(model.left_score, WIN_SCORE, out=terminations)
+        terminations |= np.greater_equal(model.right_score, WIN_SCORE, out=self._won)
+        self.infos.clear()
+        finished = terminations.any()
+        if finished:
+            self._observe()
+            np.copyto(self.final_observations, self.observations)
+            self.infos["final_observation"] = self.final_observations
+            self.infos["_final_observation"] = terminations
+        model.reset_scored()
+        if finished:
+            np.copyto(model.left_score, 0, where=terminations)
+            np.copyto(model.right_score, 0, where=terminations)
+
+        self._observe()
+        return self.observations, self.rewards, terminations, self.truncations, self.infos
+
+    def _observe(self) -> None:
+        if self._renderer is not None:
+            self._renderer.render()
+            return
+        model, obs, column = self.model, self.observations, self._column
+        # every column is computed in float64 and then copied, as casting
+        # inside the ufuncs would allocate a buffer
+        for index, values, scale in (
+            (OBS_BALL_X, model.ball_x, model.width),
+            (OBS_BALL_Y, model.ball_y, model.height),
+            (OBS_BALL_VX, model.ball_vx, 1),
+            (OBS_BALL_VY, model.ball_vy, 1),
+            (OBS_LEFT_Y, model.left_y, model.height),
+            (OBS_RIGHT_Y, model.right_y, model.height),
+        ):
+            np.copyto(column, values)
+            if scale != 1:
+                column /= scale
+            np.copyto(obs[:, index], column, casting="same_kind")
+
+    def close(self) -> None:
+        self._renderer = None
+
+
+class _PixelRenderer:
+    """Renders every match offscreen into a grayscale frame"""
+
+    def __init__(self, model: BatchGameModel, scale: int) -> None:
+        import pygame  # only needed for pixel observations
+
+        self.pygame = pygame
+        self.model = model
+        self.scale = scale
+        width, height = model.width // scale, model.height // scale
+        self.surface = pygame.Surface((width, height), depth=8)
+        self.surface.set_palette([(i, i, i) for i in range(256)])
+        self.frames = np.zeros((model.num_matches, height, width), dtype=np.uint8)
+
+    def render(self) -> None:
+        pygame, model, scale = self.pygame, self.model, self.scale
+        surface = self.surface
+        radius = max(model.radius // scale, 1)
+        paddle_width = max(PADDLE_WIDTH // scale, 1)
+        paddle_height = model.paddle_height // scale
+        left_x = (model.left_edge_x - PADDLE_WIDTH) // scale
+        right_x = model.right_edge_x // scale
+        pixels = pygame.surfarray.pixels2d(surface)  # (width, height) view, no copy
+        for i in range(model.num_matches):
+            surface.fill(0)
+            pygame.draw.circle(
+                surface,
+                255,
+                (model.ball_x[i] / scale, model.ball_y[i] / scale),
+                radius,
+            )
+            pygame.draw.rect(
+                surface, 255, (left_x, model.left_y[i] // scale, paddle_width, paddle_height)
+            )
+            pygame.draw.rect(
+                surface, 255, (right_x, model.right_y[i] // scale, paddle_width, paddle_height)
+            )
+            np.copyto(self.frames[i], pixels.T)
+        del pixels
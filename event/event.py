@@ -1,9 +1,13 @@
 """
 This module implements a simple event system for this application.
 """
+import time
+from dataclasses import dataclass
 from enum import Enum, auto
+from typing import Any, Callable
 
-subscribers: dict[str, list] = {}
+# A function that handles the data of an event
+Handler = Callable[[Any], None]
 
 
 class EventType(Enum):
@@ -11,14 +15,87 @@ class EventType(Enum):
     paddle_down = auto()
 
 
-def subscribe(event_type: EventType, fn) -> None:
-    if not event_type in subscribers:
-        subscribers[event_type] = []
-    subscribers[event_type].append(fn)
+@dataclass(slots=True)
+class EventStats:
+    """Statistics of an event type"""
 
+    posts: int = 0  # number of events dispatched to the handlers
+    coalesced: int = 0  # number of queued events merged with an earlier one
+    handler_time: float = 0.0  # total time spent in the handlers, in seconds
 
-def post_event(event_type: EventType, data) -> None:
-    if not event_type in subscribers:
-        return
-    for fn in subscribers[event_type]:
-        fn(data)
+
+class EventBus:
+    """
+    Dispatches events to the handlers subscribed to their type.
+
+    Events can be posted, which runs the handlers immediately, or
+    enqueued, which defers them until the next call to 'drain'. Enqueuing
+    the same event type with the same data more than once between drains
+    dispatches it only once.
+
+    Attributes:
+        track_stats (bool) : whether the time spent in the handlers is measured
+        stats (dict[EventType, EventStats]) : statistics of every event type
+    """
+
+    def __init__(self, track_stats: bool = False) -> None:
+        self.track_stats = track_stats
+        self.stats: dict[EventType, EventStats] = {}
+        self._subscribers: dict[EventType, list[tuple[int, Handler]]] = {}
+        self._handlers: dict[EventType, tuple[Handler, ...]] = {}
+        self._queue: dict[tuple[EventType, int], tuple[EventType, Any]] = {}
+
+    def subscribe(self, event_type: EventType, fn: Handler, priority: int = 0) -> None:
+        """Subscribes 'fn' to 'event_type'. Handlers with a higher
+        'priority' run first. Subscribing a handler twice does nothing."""
+        subscribers = self._subscribers.setdefault(event_type, [])
+        if any(handler == fn for _, handler in subscribers):
+            return
+        subscribers.append((priority, fn))
+        subscribers.sort(key=lambda subscriber: -subscriber[0])
+        self._handlers[event_type] = tuple(handler for _, handler in subscribers)
+
+    def unsubscribe(self, event_type: EventType, fn: Handler) -> None:
+        """Removes 'fn' from the handlers of 'event_type'"""
+        subscribers = self._subscribers.get(event_type, [])
+        subscribers[:] = [s for s in subscribers if s[1] != fn]
+        self._handlers[event_type] = tuple(handler for _, handler in subscribers)
+
+    def post(self, event_type: EventType, data) -> None:
+        """Runs the handlers of 'event_type' with 'data' immediately"""
+        handlers = self._handlers.get(event_type)
+        if not handlers:
+            return
+        stats = self._stats(event_type)
+        stats.posts += 1
+        if not self.track_stats:
+            for fn in handlers:
+                fn(data)
+            return
+        start = time.perf_counter()
+        for fn in handlers:
+            fn(data)
+        stats.handler_time += time.perf_counter() - start
+
+    def enqueue(self, event_type: EventType, data) -> None:
+        """Queues the event until the next call to 'drain'"""
+        key = (event_type, id(data))
+        if key in self._queue:
+            self._stats(event_type).coalesced += 1
+            return
+        self._queue[key] = (event_type, data)
+
+    def drain(self) -> None:
+        """Posts the queued events in the order they were enqueued"""
+        if not self._queue:
+            return
+        queue = self._queue
+        self._queue = {}
+        for event_type, data in queue.values():
+            self.post(event_type, data)
+
+    def _stats(self, event_type: EventType) -> EventStats:
+        stats = self.stats.get(event_type)
+        if stats is None:
+            stats = self.stats[event_type] = EventStats()
+        return stats
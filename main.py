@@ -1,15 +1,217 @@
-from view.game_view import GameView
+import argparse
+import sys
+import time
+
+from view.null_view import NullView
 from model.game_model import GameModel
-from controller.game_controller import GameController
+from controller.game_controller import GameController, RunReport
+from controller.ai_input import AIInput, PaddleAI
+from controller.frame_profiler import FrameProfiler
+from controller.input_source import EventKeyboardInput
+from model.paddle import PaddleType
+from controller.replay import RecordingInput
 
 FIELD_WIDTH, FIELD_HEIGHT = 700, 500
+ARENA_TICKS = 10_000  # ticks of an arena run without --ticks
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Pong")
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="run without a window, as fast as possible, with computer players",
+    )
+    parser.add_argument(
+        "--computer",
+        choices=("left", "right"),
+        action="append",
+        default=[],
+        help="let the computer play a side (can be repeated)",
+    )
+    parser.add_argument(
+        "--ticks",
+        type=int,
+        default=None,
+        help="stop after this number of simulation steps",
+    )
+    parser.add_argument(
+        "--threaded",
+        action="store_true",
+        help="run the simulation on its own thread, decoupled from rendering",
+    )
+    parser.add_argument(
+        "--matches",
+        type=int,
+        default=1,
+        help="run this number of matches on one asyncio event loop: the first "
+        "one as usual, the others headless with computer players",
+    )
+    parser.add_argument(
+        "--fixed-point",
+        action="store_true",
+        help="use the deterministic fixed-point physics",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="PATH",
+        default=None,
+        help="record the inputs of the match into a replay file",
+    )
+    parser.add_argument(
+        "--analytics",
+        metavar="DIR",
+        default=None,
+        help="record the hits, wall bounces and scores into the event store DIR",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        default=None,
+        help="measure the frame timings (F3 shows them) and write them to "
+        "PATH (.json or .csv) on exit",
+    )
+    parser.add_argument(
+        "--capture",
+        metavar="PATH",
+        default=None,
+        help="render offscreen and write the frames to PATH: raw RGB if it "
+        "ends in '.rgb' ('-' for the standard output), PNG files in the "
+        "PATH directory otherwise",
+    )
+    parser.add_argument(
+        "--arena",
+        metavar="BALLS",
+        type=int,
+        default=None,
+        help="run the 4-player arena with BALLS balls, headless, with computer "
+        f"players, for --ticks ticks ({ARENA_TICKS} by default)",
+    )
+    args = parser.parse_args()
+    if args.matches > 1 and (args.threaded or args.profile):
+        parser.error("--matches can't be combined with --threaded or --profile")
+    return args
+
+
+def capture_view(path: str):
+    """Returns the offscreen view writing the frames to 'path'"""
+    from view.frame_capture import FrameWriter, OffscreenView  # loads pygame
+
+    if path == "-":
+        return OffscreenView(FrameWriter(sys.stdout.buffer))
+    if path.endswith(".rgb"):
+        # the writer closes the file when the view quits
+        return OffscreenView(FrameWriter(open(path, "wb"), close_output=True))
+    return OffscreenView(FrameWriter(path))
+
+
+async def run_matches(controllers: list[GameController], max_ticks: int | None):
+    """Runs the main loop of every controller on the running event loop"""
+    import asyncio
+
+    return await asyncio.gather(*(c.mainloop_async(max_ticks) for c in controllers))
+
+
+def run_arena(num_balls: int, max_ticks: int) -> None:
+    """Runs the 4-player arena headless and prints the balls conceded by
+    every side"""
+    from model.arena_model import ArenaModel, Side, four_player_paddles
+    from controller.ai_input import arena_directions
+
+    arena = ArenaModel(
+        FIELD_WIDTH,
+        FIELD_HEIGHT,
+        num_balls,
+        four_player_paddles(FIELD_WIDTH, FIELD_HEIGHT),
+        goals=tuple(Side),
+    )
+    start = time.perf_counter()
+    for _ in range(max_ticks):
+        arena.move_paddles(arena_directions(arena))
+        arena.process()
+    print(RunReport(max_ticks, time.perf_counter() - start))
+    print(", ".join(f"{side.value} conceded {count}" for side, count in arena.conceded.items()))
 
 
 def main():
-    model = GameModel(FIELD_WIDTH, FIELD_HEIGHT)
-    view = GameView()
-    controller = GameController(model, view)
-    controller.mainloop()
+    args = parse_args()
+    if args.arena is not None:
+        run_arena(args.arena, args.ticks if args.ticks is not None else ARENA_TICKS)
+        return
+    recorders = []
+    if args.analytics:
+        from model.analytics import AnalyticsRecorder, EventStore  # loads numpy
+
+        # every match records its rows, with its index as id, in one store
+        store = EventStore(args.analytics)
+        recorders = [AnalyticsRecorder(store, match_id) for match_id in range(args.matches)]
+    recorder = recorders[0] if recorders else None
+    model = GameModel(
+        FIELD_WIDTH, FIELD_HEIGHT, fixed_point=args.fixed_point, recorder=recorder
+    )
+    key_input = None
+    if args.capture:
+        view, input_source = capture_view(args.capture), None
+        computer = {"left", "right"}
+    elif args.headless:
+        view, input_source = NullView(), None
+        computer = {"left", "right"}
+    else:
+        from view.game_view import GameView  # loads pygame
+
+        key_input = EventKeyboardInput()
+        view, input_source = GameView(), key_input
+        computer = set(args.computer)
+    if computer:
+        input_source = AIInput(
+            PaddleAI(PaddleType.LEFT_PADDLE) if "left" in computer else None,
+            PaddleAI(PaddleType.RIGHT_PADDLE) if "right" in computer else None,
+            input_source,
+        )
+    if args.record:
+        input_source = RecordingInput(input_source, model)
+    profiler = FrameProfiler() if args.profile else None
+    controller = GameController(
+        model, view, input_source, profiler=profiler, key_input=key_input
+    )
+    output = sys.stderr if args.capture == "-" else sys.stdout
+    if args.matches > 1:
+        import asyncio  # only loaded here, it's slow to import for the other runs
+
+        controllers = [controller] + [
+            GameController(
+                GameModel(
+                    FIELD_WIDTH,
+                    FIELD_HEIGHT,
+                    fixed_point=args.fixed_point,
+                    recorder=recorders[match_id] if recorders else None,
+                ),
+                NullView(),
+                AIInput(PaddleAI(PaddleType.LEFT_PADDLE), PaddleAI(PaddleType.RIGHT_PADDLE)),
+            )
+            for match_id in range(1, args.matches)
+        ]
+        reports = asyncio.run(run_matches(controllers, args.ticks))
+        report = reports[0]
+        for index, (other, other_report) in enumerate(zip(controllers, reports)):
+            metrics = other.tick_metrics
+            print(
+                f"match {index}: {other_report}, mean tick {1e6 * metrics.mean_time:.1f} us"
+                f" (worst {1e6 * metrics.max_time:.1f} us)",
+                file=output,
+            )
+    elif args.threaded:
+        report = controller.mainloop_threaded(args.ticks)
+    else:
+        report = controller.mainloop(args.ticks, args.profile)
+    if args.record:
+        input_source.save(args.record)
+    for recorder in recorders:
+        recorder.flush()
+    if args.matches == 1 and (
+        args.headless or args.capture or report.input_latency is not None
+    ):
+        print(report, file=output)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,230 @@
+"""
+This module implements the match analytics: a GameModel given an
+AnalyticsRecorder reports its paddle hits, wall bounces and scores, which
+are appended as rows to an EventStore.
+
+The store is columnar: every column of the rows is a separate typed array.
+A recorder fills one chunk of CHUNK_ROWS rows and hands it to the store
+in bulk when it's full, so recording costs one 'append' per column and
+event, and nothing for the ticks without events. The store writes the
+chunks to a directory (one .npz file each) or, without a directory,
+keeps the last 'max_chunks' in memory, so memory stays bounded in long
+sessions either way.
+"""
+from __future__ import annotations
+
+import os
+from array import array
+from typing import TYPE_CHECKING, Iterator
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .game_model import GameModel
+    from .paddle import Paddle
+    from .player import Player
+
+# Kinds of events
+HIT = 0  # the ball hit a paddle
+WALL = 1  # the ball bounced on the floor or the ceiling
+SCORE = 2  # a point was scored
+KIND_NAMES = ("hit", "wall", "score")
+
+# Sides of the field, for the hits (paddle) and the scores (scorer)
+LEFT = 0
+RIGHT = 1
+NO_SIDE = -1
+
+# Columns of a row, with their array typecode
+COLUMNS = (
+    ("match", "q"),  # id of the match
+    ("tick", "q"),  # tick of the match at which the event happened
+    ("kind", "b"),  # HIT, WALL or SCORE
+    ("side", "b"),  # LEFT, RIGHT or NO_SIDE
+    ("dy", "d"),  # hit offset from the center of the paddle (hits only)
+    ("vx", "d"),  # ball velocity after the event (before the reset for scores)
+    ("vy", "d"),
+    ("rally", "q"),  # paddle hits since the serve, this one included
+    ("duration", "q"),  # ticks since the serve
+)
+COLUMN_NAMES = tuple(name for name, _ in COLUMNS)
+
+CHUNK_ROWS = 65_536  # rows of a chunk
+MAX_CHUNKS = 16  # chunks kept by a store without a directory
+
+
+class EventStore:
+    """
+    Append-only columnar store of match events.
+
+    Attributes:
+        directory (str | None) : directory the chunks are written to, None
+            to keep them in memory
+        max_chunks (int) : chunks kept in memory without a directory, the
+            oldest ones are dropped
+        rows (int) : number of rows appended
+        dropped_rows (int) : rows dropped from memory
+    """
+
+    def __init__(self, directory: str | None = None, max_chunks: int = MAX_CHUNKS) -> None:
+        self.directory = directory
+        self.max_chunks = max_chunks
+        self.rows = 0
+        self.dropped_rows = 0
+        self.memory_chunks: list[dict[str, np.ndarray]] = []
+        self.chunk_count = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self.chunk_count = len(self._chunk_files())
+
+    def append(self, columns: dict[str, array]) -> None:
+        """Appends a chunk made of the typed arrays 'columns'"""
+        chunk = {name: np.frombuffer(columns[name], dtype=columns[name].typecode).copy()
+                 for name in COLUMN_NAMES}
+        rows = len(chunk["tick"])
+        if rows == 0:
+            return
+        self.rows += rows
+        if self.directory is not None:
+            path = os.path.join(self.directory, f"chunk-{self.chunk_count:06d}.npz")
+            np.savez(path, **chunk)
+        else:
+            self.memory_chunks.append(chunk)
+            if len(self.memory_chunks) > self.max_chunks:
+                self.dropped_rows += len(self.memory_chunks.pop(0)["tick"])
+        self.chunk_count += 1
+
+    def chunks(self) -> Iterator[dict[str, np.ndarray]]:
+        """Yields the stored chunks, from the oldest one"""
+        if self.directory is None:
+            yield from self.memory_chunks
+            return
+        for name in self._chunk_files():
+            with np.load(os.path.join(self.directory, name)) as chunk:
+                yield {column: chunk[column] for column in COLUMN_NAMES}
+
+    def _chunk_files(self) -> list[str]:
+        return sorted(
+            name
+            for name in os.listdir(self.directory)
+            if name.startswith("chunk-") and name.endswith(".npz")
+        )
+
+    def column(self, name: str, kind: int | None = None) -> np.ndarray:
+        """Returns the values of the column 'name' of every stored row, or
+        of the rows of 'kind' only"""
+        parts = []
+        for chunk in self.chunks():
+            values = chunk[name]
+            parts.append(values if kind is None else values[chunk["kind"] == kind])
+        if not parts:
+            return np.empty(0, dtype=dict(COLUMNS)[name])
+        return np.concatenate(parts)
+
+
+class AnalyticsRecorder:
+    """
+    Records the events of a GameModel (see GameModel.recorder) into an
+    EventStore, in chunks of 'chunk_rows' rows.
+
+    Attributes:
+        store (EventStore) : store the chunks are appended to
+        match_id (int) : id written in the rows of the match
+        tick (int) : ticks processed by the model
+        rally (int) : paddle hits since the serve
+        serve_tick (int) : tick of the last serve
+    """
+
+    def __init__(self, store: EventStore, match_id: int = 0, chunk_rows: int = CHUNK_ROWS) -> None:
+        self.store = store
+        self.match_id = match_id
+        self.chunk_rows = chunk_rows
+        self.columns = {name: array(typecode) for name, typecode in COLUMNS}
+        self.tick = 0
+        self.rally = 0
+        self.serve_tick = 0
+
+    def bounces(self, model: GameModel, wall: bool, left: bool, right: bool) -> None:
+        """Records the bounces of the ball in the current tick"""
+        if wall:
+            self.add(WALL, NO_SIDE, 0.0, model)
+        if left:
+            self.hit(model, model.player_left.paddle, LEFT)
+        if right:
+            self.hit(model, model.player_right.paddle, RIGHT)
+
+    def hit(self, model: GameModel, paddle: Paddle, side: int) -> None:
+        self.rally += 1
+        self.add(HIT, side, model.ball.y - (paddle.y + paddle.height / 2), model)
+
+    def score(self, model: GameModel, player: Player) -> None:
+        """Records a point scored by 'player', before the model is reset"""
+        self.add(SCORE, LEFT if player is model.player_left else RIGHT, 0.0, model)
+        self.rally = 0
+        self.serve_tick = self.tick
+
+    def add(self, kind: int, side: int, dy: float, model: GameModel) -> None:
+        """Appends a row for the current tick"""
+        columns = self.columns
+        columns["match"].append(self.match_id)
+        columns["tick"].append(self.tick)
+        columns["kind"].append(kind)
+        columns["side"].append(side)
+        columns["dy"].append(dy)
+        columns["vx"].append(model.ball.vx)
+        columns["vy"].append(model.ball.vy)
+        columns["rally"].append(self.rally)
+        columns["duration"].append(self.tick - self.serve_tick)
+        if len(columns["tick"]) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        """Appends the rows recorded so far to the store"""
+        self.store.append(self.columns)
+        for values in self.columns.values():
+            del values[:]
+
+
+# ****************************************************************** #
+# ***************************** Queries **************************** #
+# ****************************************************************** #
+
+
+def aggregate(
+    store: EventStore, kind: int, column: str, by: str | None = None
+) -> dict[int | None, dict[str, float]]:
+    """Returns the count, mean, min, p50, p95 and max of 'column' over the
+    events of 'kind', for every value of the column 'by' (a single None
+    group if 'by' is None)"""
+    values = store.column(column, kind)
+    if by is None:
+        return {None: _summary(values)}
+    keys = store.column(by, kind)
+    return {int(key): _summary(values[keys == key]) for key in np.unique(keys)}
+
+
+def _summary(values: np.ndarray) -> dict[str, float]:
+    if len(values) == 0:
+        return {"count": 0}
+    p50, p95 = np.percentile(values, (50, 95))
+    return {
+        "count": len(values),
+        "mean": float(values.mean()),
+        "min": float(values.min()),
+        "p50": float(p50),
+        "p95": float(p95),
+        "max": float(values.max()),
+    }
+
+
+def match_report(store: EventStore) -> dict[str, dict]:
+    """Returns the usual aggregations: rally lengths and times to score
+    (per scorer), hit offsets (per paddle) and ball speeds at the hits"""
+    speeds = np.hypot(store.column("vx", HIT), store.column("vy", HIT))
+    return {
+        "rally_length": aggregate(store, SCORE, "rally", by="side"),
+        "time_to_score_ticks": aggregate(store, SCORE, "duration", by="side"),
+        "hit_dy": aggregate(store, HIT, "dy", by="side"),
+        "hit_speed": {None: _summary(speeds)},
+        "wall_bounces": {None: {"count": len(store.column("tick", WALL))}},
+    }
@@ -0,0 +1,229 @@
+"""
+This module implements a game mode with any number of balls and paddles,
+for example a 4-player field or a "chaos" mode with hundreds of balls.
+Collisions between balls, and between balls and paddles, go through a
+UniformGrid broadphase so the cost of a tick grows close to linearly
+with the number of entities.
+"""
+import math
+import random
+from enum import Enum
+
+from .ball import Ball
+from .broadphase import UniformGrid
+from .game_model import BALL_VX0, BALL_VY_MAX, PADDLE_DELTA_Y, PADDLE_HEIGHT, PADDLE_WIDTH
+from .paddle import Paddle, PaddleType
+
+ARENA_BALL_RADIUS = 5
+ARENA_BALL_SPEED = BALL_VX0  # speed of the balls when they are served
+
+
+class Side(Enum):
+    LEFT = "left"
+    RIGHT = "right"
+    TOP = "top"
+    BOTTOM = "bottom"
+
+
+class ArenaModel:
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        num_balls: int,
+        paddles: list[Paddle],
+        goals: tuple[Side, ...] = (Side.LEFT, Side.RIGHT),
+        ball_radius: int = ARENA_BALL_RADIUS,
+        seed: int | None = None,
+    ) -> None:
+        """
+        Class responsible for managing the behavior of the arena mode.
+
+        Attributes:
+            width (int) : width of the field
+            height (int) : height of the field
+            balls (list[Ball]) : balls in the field
+            paddles (list[Paddle]) : paddles in the field, vertical ones
+                (higher than wide) bounce the balls horizontally and
+                horizontal ones vertically
+            goals (tuple[Side, ...]) : sides of the field where the balls
+                score, the balls bounce on the other sides
+            conceded (dict[Side, int]) : balls that went through every goal
+        """
+        self.width = width
+        self.height = height
+        self.paddles = paddles
+        self.goals = goals
+        self.conceded = {side: 0 for side in goals}
+        self.ball_radius = ball_radius
+        self.random = random.Random(seed)
+        self.balls = [
+            self.serve(
+                Ball(
+                    x=self.random.uniform(ball_radius, width - ball_radius),
+                    y=self.random.uniform(ball_radius, height - ball_radius),
+                    radius=ball_radius,
+                    vx=0,
+                    vy=0,
+                )
+            )
+            for _ in range(num_balls)
+        ]
+        self.grid = UniformGrid(width, height, 2 * ball_radius)
+
+    def serve(self, ball: Ball) -> Ball:
+        """Gives 'ball' a random direction"""
+        angle = self.random.uniform(0, 2 * math.pi)
+        ball.vx = ARENA_BALL_SPEED * math.cos(angle)
+        ball.vy = ARENA_BALL_SPEED * math.sin(angle)
+        return ball
+
+    def process(self) -> int:
+        """Advances the arena by one tick. Returns the number of balls
+        that scored in this tick."""
+        for ball in self.balls:
+            ball.move()
+        scored = self.process_walls()
+
+        grid = self.grid
+        grid.clear()
+        for index, ball in enumerate(self.balls):
+            grid.insert(index, ball.x, ball.y)
+        for paddle in self.paddles:
+            self.process_paddle(paddle)
+        for i, j in grid.pairs():
+            handle_ball_collision(self.balls[i], self.balls[j])
+        return scored
+
+    def move_paddles(self, directions: list[int]) -> None:
+        """Moves every paddle by PADDLE_DELTA_Y units in its direction (-1
+        up or left, 0 still, 1 down or right) along its axis, if it stays
+        inside the field"""
+        for paddle, direction in zip(self.paddles, directions):
+            if direction == 0:
+                continue
+            delta = PADDLE_DELTA_Y if direction > 0 else -PADDLE_DELTA_Y
+            if paddle.height >= paddle.width:
+                if self.in_bounds(paddle.y, delta, paddle.height, self.height):
+                    paddle.move(delta)
+            elif self.in_bounds(paddle.x, delta, paddle.width, self.width):
+                paddle.x += delta
+
+    @staticmethod
+    def in_bounds(position: float, delta: int, length: int, size: int) -> bool:
+        """Checks if a paddle at 'position' along an axis of the field of
+        'size' units stays inside it after a displacement of 'delta' units
+        (same rule as GameModel.in_bounds)"""
+        return 0 < position + delta <= size - length
+
+    def process_walls(self) -> int:
+        """Bounces the balls on the walls and serves again from the center
+        the ones that reached a goal"""
+        scored = 0
+        width, height, goals = self.width, self.height, self.goals
+        for ball in self.balls:
+            r = ball.radius
+            side = None
+            if ball.x - r <= 0 and ball.vx < 0:
+                side = Side.LEFT
+            elif ball.x + r >= width and ball.vx > 0:
+                side = Side.RIGHT
+            elif ball.y - r <= 0 and ball.vy < 0:
+                side = Side.TOP
+            elif ball.y + r >= height and ball.vy > 0:
+                side = Side.BOTTOM
+            if side is None:
+                continue
+            if side in goals:
+                self.conceded[side] += 1
+                scored += 1
+                ball.x, ball.y = width / 2, height / 2
+                self.serve(ball)
+            elif side in (Side.LEFT, Side.RIGHT):
+                ball.vx *= -1
+            else:
+                ball.vy *= -1
+        return scored
+
+    def process_paddle(self, paddle: Paddle) -> None:
+        """Bounces the balls that touch 'paddle'"""
+        balls = self.balls
+        x0, y0 = paddle.x, paddle.y
+        x1, y1 = x0 + paddle.width, y0 + paddle.height
+        vertical = paddle.height >= paddle.width
+        for index in self.grid.query(x0, y0, x1, y1):
+            ball = balls[index]
+            # Closest point of the paddle to the center of the ball
+            cx = min(max(ball.x, x0), x1)
+            cy = min(max(ball.y, y0), y1)
+            dx, dy = ball.x - cx, ball.y - cy
+            if dx * dx + dy * dy > ball.radius * ball.radius:
+                continue
+            if vertical:
+                direction = 1 if ball.x >= (x0 + x1) / 2 else -1
+                if ball.vx * direction < 0:
+                    ball.vx *= -1
+                    # same variable 'vy' update as 'handle_paddle_collision'
+                    half = paddle.height / 2
+                    ball.vy = BALL_VY_MAX * (ball.y - (y0 + half)) / half
+            else:
+                direction = 1 if ball.y >= (y0 + y1) / 2 else -1
+                if ball.vy * direction < 0:
+                    ball.vy *= -1
+                    half = paddle.width / 2
+                    ball.vx = BALL_VY_MAX * (ball.x - (x0 + half)) / half
+
+
+def handle_ball_collision(a: Ball, b: Ball) -> None:
+    """Handles the elastic collision of two balls of the same mass: if they
+    overlap and approach each other, they exchange the components of their
+    velocities along the line joining their centers."""
+    dx, dy = b.x - a.x, b.y - a.y
+    distance2 = dx * dx + dy * dy
+    reach = a.radius + b.radius
+    if distance2 > reach * reach or distance2 == 0:
+        return
+    # Relative velocity along the normal, negative if they approach
+    approach = (b.vx - a.vx) * dx + (b.vy - a.vy) * dy
+    if approach >= 0:
+        return
+    impulse = approach / distance2
+    a.vx += impulse * dx
+    a.vy += impulse * dy
+    b.vx -= impulse * dx
+    b.vy -= impulse * dy
+
+
+def four_player_paddles(width: int, height: int) -> list[Paddle]:
+    """Returns the paddles of a 4-player field, one on every side"""
+    return [
+        Paddle(
+            10,
+            (height - PADDLE_HEIGHT) // 2,
+            PADDLE_WIDTH,
+            PADDLE_HEIGHT,
+            PaddleType.LEFT_PADDLE,
+        ),
+        Paddle(
+            width - 10 - PADDLE_WIDTH,
+            (height - PADDLE_HEIGHT) // 2,
+            PADDLE_WIDTH,
+            PADDLE_HEIGHT,
+            PaddleType.RIGHT_PADDLE,
+        ),
+        # horizontal paddles, their type is irrelevant in the arena
+        Paddle(
+            (width - PADDLE_HEIGHT) // 2,
+            10,
+            PADDLE_HEIGHT,
+            PADDLE_WIDTH,
+            PaddleType.LEFT_PADDLE,
+        ),
+        Paddle(
+            (width - PADDLE_HEIGHT) // 2,
+            height - 10 - PADDLE_WIDTH,
+            PADDLE_HEIGHT,
+            PADDLE_WIDTH,
+            PaddleType.RIGHT_PADDLE,
+        ),
+    ]
@@ -0,0 +1,211 @@
+"""
+This module implements a vectorized version of GameModel that advances
+many independent matches at once. Every match lives in a row of a set of
+NumPy arrays, so stepping all of them is a handful of array operations
+instead of one Python call chain per match.
+"""
+import numpy as np
+
+from .game_model import (
+    BALL_RADIUS,
+    BALL_VX0,
+    BALL_VY0,
+    BALL_VY_MAX,
+    FIXED_ONE,
+    PADDLE_WIDTH,
+    PADDLE_HEIGHT,
+    TOLERANCE,
+)
+
+
+class BatchGameModel:
+    def __init__(
+        self, num_matches: int, width: int, height: int, fixed_point: bool = False
+    ) -> None:
+        """
+        Class responsible for managing 'num_matches' pong matches at once.
+        Every step produces the same results as calling GameModel.process()
+        on each match separately (created with the same 'fixed_point').
+
+        Attributes:
+            num_matches (int) : number of matches being simulated
+            width (int) : width of the pong field
+            height (int) : height of the pong field
+            fixed_point (bool) : if True the ball arrays are int64 in
+                fixed-point units (1 / FIXED_ONE pixels, see GameModel)
+                and every operation on them is integer arithmetic
+            ball_x, ball_y (np.ndarray) : position of the ball of every match
+            ball_vx, ball_vy (np.ndarray) : velocity of the ball of every match
+            left_y, right_y (np.ndarray) : 'y' coordinate of the paddles
+            left_score, right_score (np.ndarray) : score of the players
+        """
+        self.num_matches = num_matches
+        self.width = width
+        self.height = height
+        self.fixed_point = fixed_point
+
+        # Fixed geometry shared by all the matches, in the units of the ball
+        one = self.one = FIXED_ONE if fixed_point else 1
+        self.radius = BALL_RADIUS * one
+        self.paddle_height = PADDLE_HEIGHT
+        self.left_edge_x = (10 + PADDLE_WIDTH) * one
+        self.right_edge_x = (width - 10 - PADDLE_WIDTH) * one
+        self.tolerance = TOLERANCE * one
+
+        # State of every match
+        ball_dtype = np.int64 if fixed_point else np.float64
+        self.ball_x = np.empty(num_matches, dtype=ball_dtype)
+        self.ball_y = np.empty(num_matches, dtype=ball_dtype)
+        self.ball_vx = np.empty(num_matches, dtype=ball_dtype)
+        self.ball_vy = np.empty(num_matches, dtype=ball_dtype)
+        self.left_y = np.empty(num_matches, dtype=np.int64)
+        self.right_y = np.empty(num_matches, dtype=np.int64)
+        self.left_score = np.zeros(num_matches, dtype=np.int64)
+        self.right_score = np.zeros(num_matches, dtype=np.int64)
+        self.scored = np.zeros(num_matches, dtype=np.int8)  # returned by 'process'
+
+        # Scratch arrays, so stepping doesn't allocate
+        self._edge = np.empty(num_matches, dtype=ball_dtype)
+        self._tmp = np.empty(num_matches, dtype=ball_dtype)
+        self._paddle = np.empty(num_matches, dtype=ball_dtype)
+        self._hit = np.empty(num_matches, dtype=np.bool_)
+        self._cond = np.empty(num_matches, dtype=np.bool_)
+        self._left_scored = np.empty(num_matches, dtype=np.bool_)
+        self._right_scored = np.empty(num_matches, dtype=np.bool_)
+        self._new_y = np.empty(num_matches, dtype=np.int64)
+
+        self.reset()
+
+    def reset(self, mask: np.ndarray | None = None) -> None:
+        """Puts the ball and the paddles of the selected matches back to
+        their initial position. Resets every match if 'mask' is None."""
+        one = self.one
+        values = (
+            (self.ball_x, self.width // 2 * one),
+            (self.ball_y, (self.height // 2 + 10) * one),
+            (self.ball_vx, BALL_VX0 * one),
+            (self.ball_vy, BALL_VY0 * one),
+            (self.left_y, (self.height - PADDLE_HEIGHT) // 2),
+            (self.right_y, (self.height - PADDLE_HEIGHT) // 2),
+        )
+        for array, value in values:
+            if mask is None:
+                array.fill(value)
+            else:
+                np.copyto(array, value, where=mask)
+
+    def process(self, defer_reset: bool = False) -> np.ndarray:
+        """Advances every match by one tick. Returns an array holding, for
+        each match, 1 if the left player scored, -1 if the right player
+        scored and 0 if there was no score in this tick. The array is
+        self.scored, overwritten by the next tick.
+        The matches with a score are reset, unless 'defer_reset': the
+        caller can then read their final state and call 'reset_scored'."""
+        self.process_ball()
+        self.process_score()
+        if not defer_reset:
+            self.reset_scored()
+        return self.scored
+
+    def reset_scored(self) -> None:
+        """Resets the matches with a score in the last tick"""
+        np.logical_or(self._left_scored, self._right_scored, out=self._cond)
+        if self._cond.any():
+            self.reset(self._cond)
+
+    def _edges(self, position: np.ndarray, velocity: np.ndarray) -> np.ndarray:
+        """Writes into self._edge the coordinate of the edge of the balls
+        that may collide along the axis of 'position' and 'velocity'"""
+        edge = self._edge
+        np.greater_equal(velocity, 0, out=self._cond)
+        edge.fill(-self.radius)
+        np.copyto(edge, self.radius, where=self._cond)
+        edge += position
+        return edge
+
+    def _near(self, values: np.ndarray, target: int, out: np.ndarray) -> np.ndarray:
+        """Writes into 'out' whether every value is within the tolerance
+        of 'target'"""
+        tmp = self._tmp
+        np.subtract(values, target, out=tmp)
+        np.abs(tmp, out=tmp)
+        return np.less_equal(tmp, self.tolerance, out=out)
+
+    def process_ball(self) -> None:
+        """Moves the balls and handles the collisions"""
+        x, y, vx, vy = self.ball_x, self.ball_y, self.ball_vx, self.ball_vy
+
+        # move the balls
+        x += vx
+        y += vy
+
+        # floor and ceiling collisions
+        edge_y = self._edges(y, vy)
+        hit = self._near(edge_y, 0, self._hit)
+        hit |= self._near(edge_y, self.height * self.one, self._cond)
+        np.negative(vy, out=vy, where=hit)
+
+        # paddle collisions, in the same order as GameModel.process_ball
+        self._paddle_collision(self.left_y, self.left_edge_x)
+        self._paddle_collision(self.right_y, self.right_edge_x)
+
+    def _paddle_collision(self, paddle_y: np.ndarray, paddle_edge_x: int) -> None:
+        """Vectorized version of 'handle_paddle_collision'"""
+        x, y, vx, vy = self.ball_x, self.ball_y, self.ball_vx, self.ball_vy
+        one, tmp, cond = self.one, self._tmp, self._cond
+        paddle_height = self.paddle_height * one
+        hit = self._near(self._edges(x, vx), paddle_edge_x, self._hit)
+        paddle = self._paddle
+        np.copyto(paddle, paddle_y)
+        if one != 1:
+            paddle *= one
+        hit &= np.less_equal(paddle, y, out=cond)
+        np.add(paddle, paddle_height, out=tmp)
+        hit &= np.less_equal(y, tmp, out=cond)
+        if not hit.any():
+            return
+        np.negative(vx, out=vx, where=hit)
+        if self.fixed_point:
+            # same rounding towards zero as 'div_trunc'
+            half_height = paddle_height // 2
+            np.add(paddle, half_height, out=tmp)
+            np.subtract(y, tmp, out=tmp)
+            tmp *= BALL_VY_MAX * one
+            np.less(tmp, 0, out=cond)
+            np.abs(tmp, out=tmp)
+            tmp //= half_height
+            np.negative(tmp, out=tmp, where=cond)
+        else:
+            half_height = paddle_height / 2
+            np.add(paddle, half_height, out=tmp)
+            np.subtract(y, tmp, out=tmp)
+            tmp *= BALL_VY_MAX
+            tmp /= half_height
+        np.copyto(vy, tmp, where=hit)
+
+    def process_score(self) -> np.ndarray:
+        """Updates the scores and returns the scoring array described
+        in 'process'"""
+        edge_x = self._edges(self.ball_x, self.ball_vx)
+        left_scored = self._near(edge_x, self.width * self.one, self._left_scored)
+        right_scored = self._near(edge_x, 0, self._right_scored)
+        right_scored &= np.logical_not(left_scored, out=self._cond)
+        # count through an int64 copy, adding the booleans would cast them
+        points = self._new_y
+        for score, scored in ((self.left_score, left_scored), (self.right_score, right_scored)):
+            np.copyto(points, scored)
+            score += points
+        np.copyto(self.scored, left_scored)
+        np.copyto(self.scored, -1, where=right_scored)
+        return self.scored
+
+    def move_paddles(self, left_dy: np.ndarray, right_dy: np.ndarray) -> None:
+        """Moves the paddles of every match by 'left_dy' and 'right_dy'
+        units, skipping the displacements that would leave the field
+        (same rule as GameModel.in_bounds)."""
+        new_y, in_bounds, cond = self._new_y, self._hit, self._cond
+        for paddle_y, dy in ((self.left_y, left_dy), (self.right_y, right_dy)):
+            np.add(paddle_y, dy, out=new_y)
+            np.greater(new_y, 0, out=in_bounds)
+            in_bounds &= np.less_equal(new_y, self.height - self.paddle_height, out=cond)
+            np.copyto(paddle_y, new_y, where=in_bounds)
@@ -0,0 +1,81 @@
+"""
+This module implements a uniform grid broadphase: objects are binned by
+the cell their center falls in, so only objects in neighbouring cells
+need to be tested for collision. With a cell at least as large as the
+largest object, the cost grows linearly with the number of objects
+instead of quadratically.
+"""
+from collections import defaultdict
+
+# Neighbouring cells visited from every cell so each pair of cells is
+# visited only once: the cell itself plus half of its 8 neighbours.
+HALF_NEIGHBOURHOOD = ((1, 0), (-1, 1), (0, 1), (1, 1))
+
+
+class UniformGrid:
+    """
+    Grid of square cells covering a 'width' x 'height' field.
+
+    Attributes:
+        cell_size (float) : side of a cell, at least the diameter of the
+            largest object inserted
+        cells (dict[tuple[int, int], list[int]]) : indexes of the objects
+            whose center is in every non-empty cell
+    """
+
+    def __init__(self, width: int, height: int, cell_size: float) -> None:
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.cells: defaultdict[tuple[int, int], list[int]] = defaultdict(list)
+
+    def clear(self) -> None:
+        self.cells.clear()
+
+    def cell(self, x: float, y: float) -> tuple[int, int]:
+        """Returns the cell that contains the point '(x, y)'"""
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def insert(self, index: int, x: float, y: float) -> None:
+        """Inserts the object 'index' centered at '(x, y)'"""
+        self.cells[int(x // self.cell_size), int(y // self.cell_size)].append(index)
+
+    def pairs(self) -> list[tuple[int, int]]:
+        """Returns the pairs of objects that are close enough to collide"""
+        cells = self.cells
+        pairs = []
+        for (cx, cy), indexes in cells.items():
+            count = len(indexes)
+            for a in range(count):
+                i = indexes[a]
+                for b in range(a + 1, count):
+                    pairs.append((i, indexes[b]))
+            for dx, dy in HALF_NEIGHBOURHOOD:
+                neighbours = cells.get((cx + dx, cy + dy))
+                if neighbours:
+                    for i in indexes:
+                        for j in neighbours:
+                            pairs.append((i, j))
+        return pairs
+
+    def query(self, x0: float, y0: float, x1: float, y1: float) -> list[int]:
+        """Returns the objects that may overlap the rectangle with corners
+        '(x0, y0)' and '(x1, y1)'"""
+        size = self.cell_size
+        # An object centered in a neighbouring cell may reach the rectangle
+        cx0, cy0 = int(x0 // size) - 1, int(y0 // size) - 1
+        cx1, cy1 = int(x1 // size) + 1, int(y1 // size) + 1
+        cells = self.cells
+        found = []
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(cells):
+            # The rectangle covers more cells than there are non-empty ones
+            for (cx, cy), indexes in cells.items():
+                if cx0 <= cx <= cx1 and cy0 <= cy <= cy1:
+                    found.extend(indexes)
+            return found
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                indexes = cells.get((cx, cy))
+                if indexes:
+                    found.extend(indexes)
+        return found
@@ -1,8 +1,20 @@
+from __future__ import annotations
+
+from array import array
+from math import copysign
+from typing import TYPE_CHECKING, Callable
+
+from . import state
 from .player import Player
 from .ball import Ball
 from .paddle import Paddle, PaddleType
 
+if TYPE_CHECKING:
+    from .analytics import AnalyticsRecorder
+
 # CONSTANTS
+WIN_SCORE = 5  # Score for winning the game
+
 # Ball parameters
 BALL_RADIUS = 10
 BALL_VX0, BALL_VY0 = 5, 0  # ball initial velocity
@@ -12,19 +24,45 @@ BALL_VEL_MULTIPLIER = 1.1  # ball increase velocity multiplier
 # Paddle parameters
 PADDLE_WIDTH, PADDLE_HEIGHT = 20, 100  # paddle size
 PADDLE_VY = 0  # paddle movement velocity
+PADDLE_DELTA_Y = 5  # paddle displacement per tick while its input is held
 
 # Collision parameters
 TOLERANCE = 1
+MAX_BOUNCES = 8  # maximum number of bounces resolved in a single tick
+BALL_VX_MAX_CONTINUOUS = 25  # ball maximum 'x' velocity with continuous collisions
+
+# Fixed-point parameters
+FIXED_SHIFT = 8  # fractional bits of the fixed-point values
+FIXED_ONE = 1 << FIXED_SHIFT  # fixed-point value of one pixel
+FIXED_TOLERANCE = TOLERANCE * FIXED_ONE
 
 
 class GameModel:
-    def __init__(self, width: int, height: int) -> None:
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        continuous_collision: bool = False,
+        fixed_point: bool = False,
+        recorder: AnalyticsRecorder | None = None,
+    ) -> None:
         """
         Class responsible for managing the behavior of the model.
 
         Attributes:
             width (int) : width of the pong field
             height (int) : height of the pong field
+            continuous_collision (bool) : if True the ball is moved with
+                'sweep_ball', which computes the exact time of every impact
+                inside a tick, so fast balls can't go through the paddles.
+                The ball also speeds up by BALL_VEL_MULTIPLIER on every hit.
+            fixed_point (bool) : if True the ball is moved with integer
+                fixed-point arithmetic (1 / FIXED_ONE pixel units), so the
+                results are bit-for-bit reproducible on every machine. The
+                ball keeps its values in pixels, always multiples of
+                1 / FIXED_ONE.
+            recorder (AnalyticsRecorder | None) : receives the hits, wall
+                bounces and scores of the match, if not None
             ball (Ball) : Ball object of the game
             player_left (Player) : Player object at the left side of the field
             player_right (Player) : Player object at the right side of the field
@@ -32,6 +70,11 @@ class GameModel:
         # Size of the game field
         self.width = width
         self.height = height
+        self.continuous_collision = continuous_collision
+        self.fixed_point = fixed_point
+        self.recorder = recorder
+        if continuous_collision and fixed_point:
+            raise ValueError("continuous collisions don't support fixed-point physics")
 
         # Create ball
         self.ball = Ball(
@@ -68,6 +111,9 @@ class GameModel:
             ),
         )
 
+        # Ball in fixed-point units, reused by every tick of fixed-point mode
+        self.fixed_ball = Ball(0, 0, BALL_RADIUS * FIXED_ONE, 0, 0)
+
     def reset(self) -> None:
         self.ball.x = self.width // 2
         self.ball.y = self.height // 2 + 10
@@ -77,21 +123,58 @@ class GameModel:
         self.player_right.paddle.y = (self.height - PADDLE_HEIGHT) // 2
 
     def process(self) -> Player | None:
+        if self.recorder is not None:
+            self.recorder.tick += 1
         self.process_ball()
         player = self.process_score()
         if player:  # if there is a score
+            if self.recorder is not None:
+                self.recorder.score(self, player)
             self.reset()
         return player
 
     def process_ball(self) -> None:
         """Moves the ball and handles the collisions"""
+        if self.continuous_collision:
+            self.process_ball_continuous()
+            return
+        if self.fixed_point:
+            self.process_ball_fixed()
+            return
+
         # move the ball
         self.ball.move()
 
         # handle ball collisions
-        handle_floor_ceiling_collision(self.ball, self.height)
-        handle_paddle_collision(self.ball, self.player_left.paddle)
-        handle_paddle_collision(self.ball, self.player_right.paddle)
+        wall = handle_floor_ceiling_collision(self.ball, self.height)
+        left = handle_paddle_collision(self.ball, self.player_left.paddle)
+        right = handle_paddle_collision(self.ball, self.player_right.paddle)
+        if self.recorder is not None and (wall or left or right):
+            self.recorder.bounces(self, wall, left, right)
+
+    def process_ball_continuous(self) -> None:
+        """Version of 'process_ball' with swept collisions"""
+        left, right = self.player_left.paddle, self.player_right.paddle
+        on_bounce = None
+        if self.recorder is not None:
+            # recorded at the time of impact, where the ball touches the
+            # paddle, not where the rest of the tick takes it
+            def on_bounce(paddle: Paddle | None) -> None:
+                self.recorder.bounces(self, paddle is None, paddle is left, paddle is right)
+
+        sweep_ball(self.ball, self.height, (left, right), on_bounce)
+
+    def process_ball_fixed(self) -> None:
+        """Fixed-point version of 'process_ball'"""
+        fixed = self.fixed_ball
+        load_fixed(self.ball, fixed)
+        fixed.move()
+        wall = handle_floor_ceiling_collision_fixed(fixed, self.height)
+        left = handle_paddle_collision_fixed(fixed, self.player_left.paddle)
+        right = handle_paddle_collision_fixed(fixed, self.player_right.paddle)
+        store_fixed(fixed, self.ball)
+        if self.recorder is not None and (wall or left or right):
+            self.recorder.bounces(self, wall, left, right)
 
     def process_score(self) -> Player | None:
         """Process the score. If a point has been scored by a Player
@@ -99,14 +182,27 @@ class GameModel:
         back to the caller.
         Returns None if no player have scored a point in this check."""
         player = None
-        if has_scored(self.ball, edge=self.width):
+        scored = has_crossed if self.continuous_collision else has_scored
+        if scored(self.ball, edge=self.width):
             self.player_left.score += 1
             player = self.player_left
-        elif has_scored(self.ball, edge=0):
+        elif scored(self.ball, edge=0):
             self.player_right.score += 1
             player = self.player_right
         return player
 
+    def snapshot(self, buffer: array | None = None) -> array:
+        """Returns the state of the model as a flat array (see model.state).
+        Writes it into 'buffer' instead of allocating one, if given."""
+        if buffer is None:
+            buffer = state.new_state()
+        state.snapshot(self, buffer)
+        return buffer
+
+    def restore(self, buffer: array) -> None:
+        """Sets the state of the model to the one saved in 'buffer'"""
+        state.restore(self, buffer)
+
     def in_bounds(self, paddle: Paddle, dy: int):
         """Checks if the paddle is inside the field along the 'y' axis
         after a displacement of 'dy' units"""
@@ -126,15 +222,26 @@ def has_scored(ball: Ball, edge: int) -> bool:
     return False
 
 
+def has_crossed(ball: Ball, edge: int) -> bool:
+    """Returns True if the 'ball' has reached or gone past the 'edge'.
+    Used instead of 'has_scored' when the ball may move more than
+    TOLERANCE units per tick. The side of the test depends on the edge
+    only, as a fast ball can be past its center in a single tick."""
+    if edge == 0:
+        return ball.x - ball.radius <= 0
+    return ball.x + ball.radius >= edge
+
+
 # ********************************************************* #
 # ****************** Collision Functions ****************** #
 # ********************************************************* #
 
 
-def handle_paddle_collision(ball: Ball, paddle: Paddle):
+def handle_paddle_collision(ball: Ball, paddle: Paddle) -> bool:
     """Handles the collision between the ball and the paddle.
     It checks if there was a collision, reverse the direction of the ball
-    and performs a variable update for vy."""
+    and performs a variable update for vy. Returns True if there was a
+    collision."""
     has_collided = (
         abs(ball.edge.x - paddle.edge.x) <= TOLERANCE
         and paddle.y <= ball.y <= paddle.y + paddle.height
@@ -147,11 +254,13 @@ def handle_paddle_collision(ball: Ball, paddle: Paddle):
         # position of the ball and the center of the paddle.
         dy = ball.y - (paddle.y + paddle.height / 2)
         ball.vy = BALL_VY_MAX * dy / (paddle.height / 2)
+    return has_collided
 
 
-def handle_floor_ceiling_collision(ball: Ball, height: int):
+def handle_floor_ceiling_collision(ball: Ball, height: int) -> bool:
     """Handles the collision between the ball and the floor or ceiling.
-    It checks if there was a collision ans reverse the direction of the ball."""
+    It checks if there was a collision ans reverse the direction of the ball.
+    Returns True if there was a collision."""
 
     has_collided = (
         abs(ball.edge.y) <= TOLERANCE or abs(ball.edge.y - height) <= TOLERANCE
@@ -160,3 +269,155 @@ def handle_floor_ceiling_collision(ball: Ball, height: int):
     if has_collided:
         # Reverse the 'y' direction
         ball.vy *= -1
+    return has_collided
+
+
+# ********************************************************* #
+# *************** Swept Collision Functions *************** #
+# ********************************************************* #
+
+
+def sweep_ball(
+    ball: Ball,
+    height: int,
+    paddles: tuple[Paddle, ...],
+    on_bounce: Callable[[Paddle | None], None] | None = None,
+) -> int:
+    """Moves the ball along its velocity for one tick, resolving every
+    collision with the floor, the ceiling and the 'paddles' at its exact
+    time of impact. Calls 'on_bounce' after each bounce, with the ball at
+    its point of impact, with the paddle hit (None for the floor and the
+    ceiling). Returns the number of bounces resolved."""
+    remaining = 1.0  # fraction of the tick still to be simulated
+    for bounces in range(MAX_BOUNCES):
+        t_hit = remaining
+        hit_paddle = None
+        hit_wall = False
+
+        t = wall_impact_time(ball, height)
+        if t is not None and t < t_hit:
+            t_hit, hit_wall = t, True
+        for paddle in paddles:
+            t = paddle_impact_time(ball, paddle)
+            if t is not None and t < t_hit:
+                t_hit, hit_paddle, hit_wall = t, paddle, False
+
+        ball.x += ball.vx * t_hit
+        ball.y += ball.vy * t_hit
+        remaining -= t_hit
+
+        if hit_wall:
+            ball.vy *= -1
+        elif hit_paddle is not None:
+            bounce_on_paddle(ball, hit_paddle)
+        else:
+            return bounces
+        if on_bounce is not None:
+            on_bounce(hit_paddle)
+    return MAX_BOUNCES
+
+
+def wall_impact_time(ball: Ball, height: int) -> float | None:
+    """Returns the fraction of the tick at which the ball touches the floor
+    or the ceiling, or None if it's not moving towards them"""
+    if ball.vy > 0:
+        return max(0.0, (height - ball.radius - ball.y) / ball.vy)
+    if ball.vy < 0:
+        return max(0.0, (ball.radius - ball.y) / ball.vy)
+    return None
+
+
+def paddle_impact_time(ball: Ball, paddle: Paddle) -> float | None:
+    """Returns the fraction of the tick at which the edge of the ball
+    reaches the edge of the 'paddle', or None if the ball is moving away
+    from it, is already behind it or passes above or below it"""
+    if paddle.paddle_type == PaddleType.LEFT_PADDLE:
+        if ball.vx >= 0:
+            return None
+        gap = ball.x - ball.radius - paddle.edge.x
+    else:
+        if ball.vx <= 0:
+            return None
+        gap = paddle.edge.x - (ball.x + ball.radius)
+
+    if gap < -TOLERANCE:  # the ball is behind the paddle
+        return None
+    t = max(0.0, gap / abs(ball.vx))
+    y = ball.y + ball.vy * t
+    if paddle.y <= y <= paddle.y + paddle.height:
+        return t
+    return None
+
+
+def bounce_on_paddle(ball: Ball, paddle: Paddle) -> None:
+    """Reverses and speeds up the ball after hitting the 'paddle', with
+    the same variable 'vy' update as 'handle_paddle_collision'"""
+    vx = min(abs(ball.vx) * BALL_VEL_MULTIPLIER, BALL_VX_MAX_CONTINUOUS)
+    ball.vx = -copysign(vx, ball.vx)
+    dy = ball.y - (paddle.y + paddle.height / 2)
+    ball.vy = BALL_VY_MAX * dy / (paddle.height / 2)
+
+
+# ********************************************************* #
+# ************* Fixed-Point Collision Functions ************* #
+# ********************************************************* #
+
+# These functions work on a Ball in fixed-point units (1 / FIXED_ONE pixels)
+# and on Paddles in pixels, using only integer arithmetic.
+
+
+def to_fixed(value: float) -> int:
+    """Returns the fixed-point value closest to 'value' pixels"""
+    return round(value * FIXED_ONE)
+
+
+def div_trunc(a: int, b: int) -> int:
+    """Integer division rounding towards zero ('//' rounds towards minus
+    infinity), so mirrored hits give mirrored velocities"""
+    q = abs(a) // abs(b)
+    return q if (a < 0) == (b < 0) else -q
+
+
+def load_fixed(ball: Ball, fixed: Ball) -> None:
+    """Writes the position and velocity of 'ball' into 'fixed'"""
+    fixed.x = to_fixed(ball.x)
+    fixed.y = to_fixed(ball.y)
+    fixed.vx = to_fixed(ball.vx)
+    fixed.vy = to_fixed(ball.vy)
+
+
+def store_fixed(fixed: Ball, ball: Ball) -> None:
+    """Writes the position and velocity of 'fixed' into 'ball'. The values
+    in pixels are exact, so 'load_fixed' gives them back unchanged."""
+    ball.x = fixed.x / FIXED_ONE
+    ball.y = fixed.y / FIXED_ONE
+    ball.vx = fixed.vx / FIXED_ONE
+    ball.vy = fixed.vy / FIXED_ONE
+
+
+def handle_paddle_collision_fixed(ball: Ball, paddle: Paddle) -> bool:
+    """Fixed-point version of 'handle_paddle_collision'"""
+    paddle_y = paddle.y * FIXED_ONE
+    paddle_height = paddle.height * FIXED_ONE
+    has_collided = (
+        abs(ball.edge.x - paddle.edge.x * FIXED_ONE) <= FIXED_TOLERANCE
+        and paddle_y <= ball.y <= paddle_y + paddle_height
+    )
+
+    if has_collided:
+        ball.vx *= -1
+        half_height = paddle_height // 2
+        dy = ball.y - (paddle_y + half_height)
+        ball.vy = div_trunc(BALL_VY_MAX * FIXED_ONE * dy, half_height)
+    return has_collided
+
+
+def handle_floor_ceiling_collision_fixed(ball: Ball, height: int) -> bool:
+    """Fixed-point version of 'handle_floor_ceiling_collision'"""
+    edge_y = ball.edge.y
+    has_collided = (
+        abs(edge_y) <= FIXED_TOLERANCE or abs(edge_y - height * FIXED_ONE) <= FIXED_TOLERANCE
+    )
+    if has_collided:
+        ball.vy *= -1
+    return has_collided
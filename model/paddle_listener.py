@@ -1,16 +1,16 @@
-import controller.game_controller as game_controller
-from event.event import subscribe, EventType
+from event.event import EventBus, EventType
+from model.game_model import PADDLE_DELTA_Y
 from model.paddle import Paddle
 
 
 def handle_paddle_up(paddle: Paddle):
-    paddle.move(-game_controller.PADDLE_DELTA_Y)
+    paddle.move(-PADDLE_DELTA_Y)
 
 
 def handle_paddle_down(paddle: Paddle):
-    paddle.move(game_controller.PADDLE_DELTA_Y)
+    paddle.move(PADDLE_DELTA_Y)
 
 
-def setup_paddle_event_handlers():
-    subscribe(EventType.paddle_up, handle_paddle_up)
-    subscribe(EventType.paddle_down, handle_paddle_down)
+def setup_paddle_event_handlers(event_bus: EventBus):
+    event_bus.subscribe(EventType.paddle_up, handle_paddle_up)
+    event_bus.subscribe(EventType.paddle_down, handle_paddle_down)
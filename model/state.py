@@ -0,0 +1,94 @@
+"""
+This module implements a compact representation of the state of a
+GameModel: a flat array of doubles that can be saved and restored
+without allocating, and a ring buffer of the states of the last ticks,
+used for rollback and prediction.
+"""
+from __future__ import annotations
+
+from array import array
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .game_model import GameModel
+
+# Layout of a state
+BALL_X, BALL_Y, BALL_VX, BALL_VY, LEFT_Y, RIGHT_Y, LEFT_SCORE, RIGHT_SCORE = range(8)
+STATE_SIZE = 8  # number of values of a state
+
+
+def new_state(count: int = 1) -> array:
+    """Returns a zeroed buffer able to hold 'count' states"""
+    return array("d", bytes(8 * STATE_SIZE * count))
+
+
+def snapshot(model: GameModel, state: array, offset: int = 0) -> None:
+    """Writes the state of 'model' into 'state' starting at 'offset'"""
+    ball = model.ball
+    state[offset + BALL_X] = ball.x
+    state[offset + BALL_Y] = ball.y
+    state[offset + BALL_VX] = ball.vx
+    state[offset + BALL_VY] = ball.vy
+    state[offset + LEFT_Y] = model.player_left.paddle.y
+    state[offset + RIGHT_Y] = model.player_right.paddle.y
+    state[offset + LEFT_SCORE] = model.player_left.score
+    state[offset + RIGHT_SCORE] = model.player_right.score
+
+
+def restore(model: GameModel, state: array, offset: int = 0) -> None:
+    """Sets the state of 'model' to the one stored in 'state' at 'offset'"""
+    ball = model.ball
+    ball.x = state[offset + BALL_X]
+    ball.y = state[offset + BALL_Y]
+    ball.vx = state[offset + BALL_VX]
+    ball.vy = state[offset + BALL_VY]
+    model.player_left.paddle.y = int(state[offset + LEFT_Y])
+    model.player_right.paddle.y = int(state[offset + RIGHT_Y])
+    model.player_left.score = int(state[offset + LEFT_SCORE])
+    model.player_right.score = int(state[offset + RIGHT_SCORE])
+
+
+class StateHistory:
+    """
+    Ring buffer holding the states of the last 'capacity' ticks.
+
+    Attributes:
+        capacity (int) : number of ticks kept
+        buffer (array) : states, one after the other
+        ticks (array) : tick stored in every slot of the buffer (-1 if empty)
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.buffer = new_state(capacity)
+        self.ticks = array("q", [-1]) * capacity
+        self.latest = -1  # last tick saved
+
+    def save(self, model: GameModel, tick: int) -> None:
+        """Stores the state of 'model' as the state of 'tick'"""
+        slot = tick % self.capacity
+        snapshot(model, self.buffer, slot * STATE_SIZE)
+        self.ticks[slot] = tick
+        if tick > self.latest:
+            self.latest = tick
+
+    def load(self, model: GameModel, tick: int) -> bool:
+        """Restores 'model' to the state of 'tick'. Returns False if that
+        tick is no longer (or not yet) in the buffer."""
+        slot = tick % self.capacity
+        if self.ticks[slot] != tick:
+            return False
+        restore(model, self.buffer, slot * STATE_SIZE)
+        return True
+
+    def contains(self, tick: int) -> bool:
+        return self.ticks[tick % self.capacity] == tick
+
+    def get(self, tick: int) -> memoryview | None:
+        """Returns a view of the stored state of 'tick', None if it's not
+        in the buffer"""
+        slot = tick % self.capacity
+        if self.ticks[slot] != tick:
+            return None
+        start = slot * STATE_SIZE
+        return memoryview(self.buffer)[start : start + STATE_SIZE]
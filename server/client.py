@@ -0,0 +1,63 @@
+"""
+This module implements a client of the match server, used by remote
+players and by local loopback tests.
+"""
+import asyncio
+from array import array
+from collections import deque
+
+from . import protocol
+
+KEPT_STATES = 128  # ticks of received states kept to decode the deltas
+
+
+class MatchClient:
+    """
+    Client playing one side of a match of a MatchServer.
+
+    Attributes:
+        tick (int) : tick of the last state received
+        state (array | None) : last state received (see model.state)
+    """
+
+    def __init__(self) -> None:
+        self.tick = -1
+        self.state: array | None = None
+        self.states: dict[int, array] = {}
+        self._ticks: deque[int] = deque()  # ticks of 'states', oldest first
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def connect(self, host: str, port: int, match_id: int, side: int) -> None:
+        self._reader, self._writer = await asyncio.open_connection(host, port)
+        self._writer.write(protocol.JOIN_MESSAGE.pack(protocol.JOIN, match_id, side))
+        await self._writer.drain()
+
+    def send_input(self, direction: int) -> None:
+        """Sends the paddle direction, acknowledging the last state received"""
+        ack_tick = self.tick if self.tick >= 0 else protocol.NO_BASE
+        self._writer.write(protocol.INPUT_MESSAGE.pack(protocol.INPUT, ack_tick, direction))
+
+    async def receive(self) -> array:
+        """Waits for the next state update and returns the decoded state"""
+        _, tick, base_tick, mask = protocol.STATE_HEADER.unpack(
+            await self._reader.readexactly(protocol.STATE_HEADER.size)
+        )
+        data = await self._reader.readexactly(protocol.state_values_size(mask))
+        base = None if base_tick == protocol.NO_BASE else self.states[base_tick]
+        state = protocol.decode_state_values(mask, data, base)
+
+        self.states[tick] = state
+        self._ticks.append(tick)
+        # The server skips the updates of a client with a full write buffer,
+        # so the ticks have gaps: evict by age, not by key
+        ticks = self._ticks
+        while ticks[0] <= tick - KEPT_STATES:
+            self.states.pop(ticks.popleft(), None)
+        self.tick, self.state = tick, state
+        return state
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
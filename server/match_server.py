@@ -0,0 +1,230 @@
+"""
+This module implements an authoritative match server: many GameModel
+matches stepped by a single fixed-rate tick scheduler on an asyncio event
+loop, with clients sending their paddle input over TCP and receiving the
+delta-encoded state of their match after every tick.
+"""
+import asyncio
+import itertools
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from controller.frame_profiler import TickMetrics
+from controller.replay import apply_input
+from model.game_model import GameModel, WIN_SCORE
+from model.state import StateHistory, new_state
+
+from . import protocol
+
+TICK_RATE = 60  # ticks per second
+HISTORY_TICKS = 64  # states kept per match to delta-encode against
+MAX_LAG_TICKS = 5  # ticks the scheduler may fall behind before dropping ticks
+WRITE_BUFFER_LIMIT = 64 * 1024  # updates to slower clients are skipped
+
+
+@dataclass(eq=False)
+class ClientConnection:
+    writer: asyncio.StreamWriter
+    side: int
+    ack_tick: int = -1  # last tick acknowledged by the client
+    # last ticks sent to the client, the only ones it can acknowledge
+    sent_ticks: deque[int] = field(default_factory=lambda: deque(maxlen=HISTORY_TICKS))
+
+
+@dataclass(eq=False)
+class Match:
+    """
+    Match hosted by the server.
+
+    Attributes:
+        match_id (int) : identifier used by the clients to join the match
+        model (GameModel) : authoritative model of the match
+        inputs (list[int]) : last direction received from each side
+        clients (list[ClientConnection]) : clients receiving the updates
+        history (StateHistory) : states of the last ticks
+        tick (int) : number of ticks simulated
+        finished (bool) : whether a player has reached WIN_SCORE
+        metrics (TickMetrics) : time spent stepping the match
+    """
+
+    match_id: int
+    model: GameModel
+    inputs: list[int] = field(default_factory=lambda: [0, 0])
+    clients: list[ClientConnection] = field(default_factory=list)
+    history: StateHistory = field(default_factory=lambda: StateHistory(HISTORY_TICKS))
+    tick: int = 0
+    finished: bool = False
+    metrics: TickMetrics = field(default_factory=TickMetrics)
+
+    def step(self) -> None:
+        """Simulates one tick, in the same order as GameController.step"""
+        start = time.perf_counter()
+        model = self.model
+        apply_input(model, self.inputs[protocol.LEFT], self.inputs[protocol.RIGHT])
+        player = model.process()
+        self.tick += 1
+        self.history.save(model, self.tick)
+        if player and player.score >= WIN_SCORE:
+            self.finished = True
+        self.metrics.add(time.perf_counter() - start)
+
+
+class MatchServer:
+    """
+    Hosts many matches and steps all of them from a single scheduler.
+
+    Attributes:
+        tick_rate (int) : ticks per second of every match
+        matches (dict[int, Match]) : hosted matches by id
+        ticks (int) : number of scheduler ticks
+        late_ticks (int) : scheduler ticks that started after their deadline
+    """
+
+    def __init__(self, tick_rate: int = TICK_RATE) -> None:
+        self.tick_rate = tick_rate
+        self.matches: dict[int, Match] = {}
+        self.ticks = 0
+        self.late_ticks = 0
+        self._ids = itertools.count()
+        self._server: asyncio.base_events.Server | None = None
+        self._scheduler: asyncio.Task | None = None
+
+    def create_match(self, width: int = 700, height: int = 500) -> Match:
+        """Creates a new match and returns it"""
+        match = Match(next(self._ids), GameModel(width, height))
+        match.history.save(match.model, 0)
+        self.matches[match.match_id] = match
+        return match
+
+    def remove_match(self, match_id: int) -> None:
+        match = self.matches.pop(match_id)
+        for client in match.clients:
+            client.writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> tuple[str, int]:
+        """Starts accepting clients and stepping the matches. Returns the
+        address the server listens on."""
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        self._scheduler = asyncio.create_task(self._run_scheduler())
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def stop(self) -> None:
+        if self._scheduler is not None:
+            self._scheduler.cancel()
+            try:
+                await self._scheduler
+            except asyncio.CancelledError:
+                pass
+        for match_id in list(self.matches):
+            self.remove_match(match_id)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    # ************************** Scheduler ************************** #
+
+    async def _run_scheduler(self) -> None:
+        loop = asyncio.get_running_loop()
+        tick_time = 1 / self.tick_rate
+        deadline = loop.time()
+        while True:
+            self.tick()
+            deadline += tick_time
+            delay = deadline - loop.time()
+            if delay < 0:
+                self.late_ticks += 1
+                if delay < -MAX_LAG_TICKS * tick_time:
+                    deadline = loop.time()  # too far behind, drop the missed ticks
+            await asyncio.sleep(max(delay, 0))
+
+    def tick(self) -> None:
+        """Steps every running match once and sends the new states"""
+        self.ticks += 1
+        state = new_state()
+        for match in self.matches.values():
+            if match.finished:
+                continue
+            match.step()
+            if match.clients:
+                match.model.snapshot(state)
+                self._broadcast(match, state)
+
+    def _broadcast(self, match: Match, state) -> None:
+        full_update = None
+        for client in match.clients:
+            transport = client.writer.transport
+            if transport.is_closing() or transport.get_write_buffer_size() > WRITE_BUFFER_LIMIT:
+                continue
+            base = match.history.get(client.ack_tick) if client.ack_tick >= 0 else None
+            if base is None:
+                if full_update is None:
+                    full_update = protocol.encode_state(match.tick, state)
+                client.writer.write(full_update)
+            else:
+                client.writer.write(
+                    protocol.encode_state(match.tick, state, client.ack_tick, base)
+                )
+            client.sent_ticks.append(match.tick)
+
+    # *************************** Clients *************************** #
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        client = None
+        match = None
+        try:
+            _, match_id, side = protocol.JOIN_MESSAGE.unpack(
+                await reader.readexactly(protocol.JOIN_MESSAGE.size)
+            )
+            match = self.matches.get(match_id)
+            if match is None or side not in (protocol.LEFT, protocol.RIGHT):
+                return
+            client = ClientConnection(writer, side)
+            match.clients.append(client)
+            while True:
+                _, ack_tick, direction = protocol.INPUT_MESSAGE.unpack(
+                    await reader.readexactly(protocol.INPUT_MESSAGE.size)
+                )
+                # a delta is only decodable against a state the client has
+                if ack_tick in client.sent_ticks:
+                    client.ack_tick = max(client.ack_tick, ack_tick)
+                match.inputs[side] = max(-1, min(direction, 1))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if client is not None and client in match.clients:
+                match.clients.remove(client)
+            writer.close()
+
+
+async def serve(num_matches: int, port: int) -> None:
+    """Hosts 'num_matches' matches and prints the tick metrics every second"""
+    server = MatchServer()
+    for _ in range(num_matches):
+        server.create_match()
+    host, port = await server.start(port=port)
+    print(f"Serving {num_matches} matches on {host}:{port}")
+    try:
+        while True:
+            await asyncio.sleep(1)
+            metrics = [match.metrics for match in server.matches.values()]
+            mean = sum(m.mean_time for m in metrics) / max(len(metrics), 1)
+            worst = max((m.max_time for m in metrics), default=0.0)
+            print(
+                f"ticks={server.ticks} late={server.late_ticks} "
+                f"mean tick={mean * 1e6:.1f} us worst tick={worst * 1e6:.1f} us"
+            )
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pong match server")
+    parser.add_argument("--matches", type=int, default=100)
+    parser.add_argument("--port", type=int, default=7777)
+    args = parser.parse_args()
+    asyncio.run(serve(args.matches, args.port))
@@ -0,0 +1,65 @@
+"""
+This module implements the binary messages exchanged between the match
+server and its clients. Every message starts with a byte with its type.
+
+Client -> server:
+    JOIN    : match id, side (0 left, 1 right)
+    INPUT   : last state tick received (acknowledged), NO_BASE before the
+              first one, paddle direction
+
+Server -> client:
+    STATE   : tick, base tick, mask, values
+        The state of the match (see model.state) delta-encoded against the
+        state of 'base tick', the last one acknowledged by the client:
+        only the fields whose bit is set in 'mask' are sent, as float32.
+        A base tick of NO_BASE means every field is sent.
+"""
+import struct
+from array import array
+
+from model.state import STATE_SIZE
+
+JOIN, INPUT, STATE = 1, 2, 3
+
+JOIN_MESSAGE = struct.Struct("<BIB")
+INPUT_MESSAGE = struct.Struct("<BIb")
+STATE_HEADER = struct.Struct("<BIIB")
+STATE_FIELD = struct.Struct("<f")
+# Tells the client that the state message is not delta-encoded, and the
+# server that the client hasn't received any state yet
+NO_BASE = 0xFFFFFFFF
+FULL_MASK = (1 << STATE_SIZE) - 1
+
+LEFT, RIGHT = 0, 1  # sides of the field a client can play on
+
+
+def encode_state(tick: int, state, base_tick: int = NO_BASE, base=None) -> bytes:
+    """Encodes 'state' delta-encoded against 'base', the state of
+    'base_tick'. Sends the full state if 'base' is None."""
+    mask = 0
+    values = []
+    for i in range(STATE_SIZE):
+        if base is None or state[i] != base[i]:
+            mask |= 1 << i
+            values.append(state[i])
+    if base is None:
+        base_tick = NO_BASE
+    return STATE_HEADER.pack(STATE, tick, base_tick, mask) + struct.pack(
+        f"<{len(values)}f", *values
+    )
+
+
+def state_values_size(mask: int) -> int:
+    """Returns the size in bytes of the values of a state message"""
+    return STATE_FIELD.size * mask.bit_count()
+
+
+def decode_state_values(mask: int, data: bytes, base: array | None) -> array:
+    """Returns the state obtained by applying the values 'data' of a state
+    message with 'mask' on top of 'base'"""
+    state = array("d", base) if base is not None else array("d", bytes(8 * STATE_SIZE))
+    values = iter(struct.unpack(f"<{mask.bit_count()}f", data))
+    for i in range(STATE_SIZE):
+        if mask & (1 << i):
+            state[i] = next(values)
+    return state
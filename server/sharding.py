@@ -0,0 +1,190 @@
+"""
+This module implements the sharding of matches across a pool of worker
+processes. The state of every match lives in a single
+multiprocessing.shared_memory block, so the coordinator (or a renderer,
+or a spectator) reads any match without pickling or IPC round-trips.
+
+Every match has a slot of SLOT_SIZE doubles in the block: a sequence
+number followed by the state of the match (see model.state). The worker
+makes the sequence number odd while it writes the state and even, twice
+the number of ticks simulated, when it's done (a seqlock), so readers can
+detect and retry torn reads.
+"""
+import multiprocessing as mp
+import os
+import time
+from array import array
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.synchronize import Event
+
+from controller.ai_input import AIInput, PaddleAI
+from controller.replay import apply_input
+from model.game_model import GameModel, WIN_SCORE
+from model.paddle import PaddleType
+from model.state import STATE_SIZE, new_state, snapshot
+
+SLOT_SIZE = 1 + STATE_SIZE  # sequence number + state
+SEQUENCE = 0  # position of the sequence number in a slot
+READ_SPINS = 64  # torn reads retried at once before yielding the CPU
+READ_RETRIES = 10_000  # torn reads before giving up on a match
+
+
+def _run_shard(
+    shm_name: str,
+    first: int,
+    count: int,
+    width: int,
+    height: int,
+    tick_rate: int | None,
+    stop: Event,
+) -> None:
+    """Worker process: steps the matches [first, first + count), played by
+    computer players, and publishes their state in the shared memory block"""
+    shm = SharedMemory(shm_name)
+    slots = None
+    try:
+        slots = shm.buf.cast("d")
+        models = [GameModel(width, height) for _ in range(count)]
+        players = [_computer_players() for _ in range(count)]
+        tick_time = 1 / tick_rate if tick_rate else 0.0
+        deadline = time.perf_counter()
+        tick = 0
+        while not stop.is_set():
+            tick += 1
+            for i, model in enumerate(models):
+                # same order as GameController.step: the input before the model
+                apply_input(model, *players[i].read(model))
+                player = model.process()
+                if player and player.score >= WIN_SCORE:  # start a new match
+                    models[i] = model = GameModel(width, height)
+                    players[i] = _computer_players()
+                offset = (first + i) * SLOT_SIZE
+                slots[offset + SEQUENCE] = 2 * tick - 1
+                snapshot(model, slots, offset + 1)
+                slots[offset + SEQUENCE] = 2 * tick
+            if tick_time:
+                deadline += tick_time
+                delay = deadline - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+    finally:
+        # the view must be released first or closing the block fails
+        if slots is not None:
+            slots.release()
+        shm.close()
+
+
+def _computer_players() -> AIInput:
+    return AIInput(PaddleAI(PaddleType.LEFT_PADDLE), PaddleAI(PaddleType.RIGHT_PADDLE))
+
+
+class ShardPool:
+    """
+    Runs 'num_matches' matches spread over 'num_workers' processes.
+
+    Attributes:
+        num_matches (int) : number of matches
+        num_workers (int) : number of worker processes
+        tick_rate (int | None) : ticks per second of every match, None to
+            run as fast as possible
+    """
+
+    def __init__(
+        self,
+        num_matches: int,
+        num_workers: int | None = None,
+        width: int = 700,
+        height: int = 500,
+        tick_rate: int | None = None,
+    ) -> None:
+        if num_matches < 1:
+            raise ValueError(f"a ShardPool needs at least one match, got {num_matches}")
+        self.num_matches = num_matches
+        self.num_workers = min(num_workers or os.cpu_count() or 1, num_matches)
+        self.width = width
+        self.height = height
+        self.tick_rate = tick_rate
+        self.shm: SharedMemory | None = None
+        self.slots: memoryview | None = None
+        self.workers: list[mp.Process] = []
+        self._stop = mp.Event()
+
+    def start(self) -> None:
+        self.shm = SharedMemory(create=True, size=8 * SLOT_SIZE * self.num_matches)
+        self.slots = self.shm.buf.cast("d")
+        self._stop.clear()
+        per_worker, extra = divmod(self.num_matches, self.num_workers)
+        first = 0
+        for i in range(self.num_workers):
+            count = per_worker + (i < extra)
+            worker = mp.Process(
+                target=_run_shard,
+                args=(
+                    self.shm.name,
+                    first,
+                    count,
+                    self.width,
+                    self.height,
+                    self.tick_rate,
+                    self._stop,
+                ),
+                daemon=True,
+            )
+            worker.start()
+            self.workers.append(worker)
+            first += count
+
+    def stop(self) -> None:
+        self._stop.set()
+        for worker in self.workers:
+            worker.join()
+        self.workers.clear()
+        if self.shm is not None:
+            self.slots.release()
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = self.slots = None
+
+    def __enter__(self) -> "ShardPool":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def ticks(self, match_id: int) -> int:
+        """Returns the number of ticks simulated by the match"""
+        return int(self.slots[match_id * SLOT_SIZE + SEQUENCE]) // 2
+
+    def total_ticks(self) -> int:
+        """Returns the number of ticks simulated by all the matches"""
+        slots = self.slots
+        return sum(
+            int(slots[offset]) // 2
+            for offset in range(SEQUENCE, self.num_matches * SLOT_SIZE, SLOT_SIZE)
+        )
+
+    def read_state(self, match_id: int, state: array | None = None) -> array:
+        """Returns the current state of the match (see model.state).
+        Writes it into 'state' instead of allocating one, if given. Raises
+        TimeoutError if the worker never finishes writing it (READ_RETRIES
+        torn reads), e.g. because it died in the middle of a write."""
+        if state is None:
+            state = new_state()
+        target = memoryview(state)
+        offset = match_id * SLOT_SIZE
+        source = self.slots[offset + 1 : offset + SLOT_SIZE]
+        try:
+            for retry in range(READ_RETRIES):
+                if retry >= READ_SPINS:
+                    time.sleep(0)  # let the worker finish its write
+                sequence = self.slots[offset + SEQUENCE]
+                if sequence % 2:  # the worker is writing the state
+                    continue
+                target[:] = source
+                if self.slots[offset + SEQUENCE] == sequence:
+                    return state
+            raise TimeoutError(f"the state of match {match_id} is still being written")
+        finally:
+            source.release()
+            target.release()
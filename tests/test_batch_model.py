@@ -0,0 +1,50 @@
+import random
+
+import numpy as np
+
+from controller.replay import apply_input
+from model.batch_model import BatchGameModel
+from model.game_model import PADDLE_DELTA_Y, GameModel
+
+MATCHES = 16
+TICKS = 3_000
+
+
+def states(batch: BatchGameModel) -> np.ndarray:
+    """Returns the states of the matches of 'batch' laid out as
+    GameModel.snapshot"""
+    return np.column_stack(
+        (
+            batch.ball_x,
+            batch.ball_y,
+            batch.ball_vx,
+            batch.ball_vy,
+            batch.left_y,
+            batch.right_y,
+            batch.left_score,
+            batch.right_score,
+        )
+    ).astype(np.float64)
+
+
+def test_batch_matches_game_models():
+    rng = random.Random(0)
+    models = [GameModel(700, 500) for _ in range(MATCHES)]
+    batch = BatchGameModel(MATCHES, 700, 500)
+    left_dy = np.empty(MATCHES, dtype=np.int64)
+    right_dy = np.empty(MATCHES, dtype=np.int64)
+    for _ in range(TICKS):
+        scored = []
+        for i, model in enumerate(models):
+            left, right = rng.randint(-1, 1), rng.randint(-1, 1)
+            apply_input(model, left, right)
+            player = model.process()
+            scored.append(0 if player is None else 1 if player is model.player_left else -1)
+            left_dy[i] = left * PADDLE_DELTA_Y
+            right_dy[i] = right * PADDLE_DELTA_Y
+        batch.move_paddles(left_dy, right_dy)
+        assert batch.process().tolist() == scored
+
+    expected = np.array([model.snapshot() for model in models])
+    assert np.array_equal(states(batch), expected)
+    assert expected[:, 6:].sum() > 0  # the run went through scores and resets
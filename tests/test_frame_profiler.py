@@ -0,0 +1,19 @@
+from controller.frame_profiler import FRAME, FrameProfiler, LatencyRecorder
+
+
+def test_worst_frame_outlives_the_ring_buffer():
+    profiler = FrameProfiler(capacity=10)
+    profiler.end_frame(0.5)
+    for _ in range(20):
+        profiler.end_frame(0.01)
+    stats = profiler.stats()[FRAME]
+    assert stats.p99 == 10.0
+    assert stats.worst == 500.0
+
+
+def test_worst_latency_outlives_the_ring_buffer():
+    recorder = LatencyRecorder(capacity=4)
+    recorder.add(1.0)
+    for _ in range(8):
+        recorder.add(0.001)
+    assert recorder.stats().worst == 1000.0
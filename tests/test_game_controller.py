@@ -0,0 +1,15 @@
+from controller.ai_input import AIInput, PaddleAI
+from controller.game_controller import GameController
+from model.game_model import GameModel
+from model.paddle import PaddleType
+from view.null_view import NullView
+
+
+def test_headless_frames_show_their_tick():
+    model = GameModel(700, 500)
+    players = AIInput(PaddleAI(PaddleType.LEFT_PADDLE), PaddleAI(PaddleType.RIGHT_PADDLE))
+    controller = GameController(model, NullView(), players)
+    controller.mainloop(7)
+    assert (controller.render_ball.x, controller.render_ball.y) == (model.ball.x, model.ball.y)
+    assert controller.render_paddle_left.y == model.player_left.paddle.y
+    assert controller.render_paddle_right.y == model.player_right.paddle.y
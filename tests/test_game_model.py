@@ -0,0 +1,45 @@
+from model.game_model import BALL_RADIUS, GameModel, has_crossed, sweep_ball
+
+
+def test_has_crossed_fast_ball():
+    """A ball faster than its diameter still scores once past the edge"""
+    model = GameModel(700, 500, continuous_collision=True)
+    model.player_left.paddle.y = model.height - model.player_left.paddle.height
+    ball = model.ball
+    ball.x, ball.y, ball.vx, ball.vy = 62, 100, -25, 0
+    assert abs(ball.vx) > 2 * BALL_RADIUS
+
+    scorers = [model.process() for _ in range(3)]  # x = 37, 12, -13
+    assert scorers == [None, None, model.player_right]
+    assert model.player_right.score == 1
+
+
+def test_has_crossed_sides():
+    model = GameModel(700, 500, continuous_collision=True)
+    ball = model.ball
+    ball.x = -13  # past the left edge, center included
+    assert has_crossed(ball, 0)
+    assert not has_crossed(ball, model.width)
+    ball.x = model.width + 13
+    assert has_crossed(ball, model.width)
+    assert not has_crossed(ball, 0)
+
+
+def test_sweep_ball_bounces_fast_ball_on_paddle():
+    """A ball moving farther than the paddle width in a tick bounces
+    instead of going through it"""
+    model = GameModel(700, 500, continuous_collision=True)
+    paddle = model.player_left.paddle
+    ball = model.ball
+    ball.x, ball.y, ball.vx, ball.vy = 62, paddle.y + paddle.height / 2, -25, 0
+    assert sweep_ball(ball, model.height, (paddle,)) == 1
+    # the edge of the ball reaches the paddle (x = 30) after 22 of its 25
+    # units, and goes back 3 units at the capped speed
+    assert (ball.x, ball.vx) == (paddle.edge.x + BALL_RADIUS + 3, 25)
+
+
+def test_sweep_ball_bounces_on_walls_within_a_tick():
+    ball = GameModel(700, 500, continuous_collision=True).ball
+    ball.x, ball.y, ball.vx, ball.vy = 300, 15, 0, -20
+    assert sweep_ball(ball, 500, ()) == 1
+    assert (ball.y, ball.vy) == (25, 20)  # 5 units up to the ceiling, 15 down
@@ -0,0 +1,54 @@
+import pytest
+
+from controller.ai_input import AIInput, PaddleAI
+from controller.replay import RecordingInput, Replay, ReplayError, apply_input
+from model.game_model import GameModel
+from model.paddle import PaddleType
+
+TICKS = 1_000
+
+
+def record(path, **model_options) -> list:
+    """Records a match of computer players into 'path' and returns the
+    state of the model after every tick, starting with the initial one"""
+    model = GameModel(700, 500, **model_options)
+    players = AIInput(
+        PaddleAI(PaddleType.LEFT_PADDLE, seed=1), PaddleAI(PaddleType.RIGHT_PADDLE, seed=2)
+    )
+    recording = RecordingInput(players, model, keyframe_interval=64)
+    states = [model.snapshot()]
+    for _ in range(TICKS):
+        left, right = recording.read(model)
+        apply_input(model, left, right)
+        model.process()
+        states.append(model.snapshot())
+    recording.save(str(path))
+    return states
+
+
+@pytest.mark.parametrize("options", [{}, {"fixed_point": True}, {"continuous_collision": True}])
+def test_replay_reproduces_the_match(tmp_path, options):
+    path = tmp_path / "match.replay"
+    states = record(path, **options)
+    with Replay(str(path)) as replay:
+        replay.run()
+        assert replay.tick == TICKS
+        assert replay.model.snapshot() == states[-1]
+
+
+def test_seek_forward_and_backward(tmp_path):
+    path = tmp_path / "match.replay"
+    states = record(path)
+    with Replay(str(path)) as replay:
+        for tick in (500, 130, 64, 0, 999, 63, 700, 701, TICKS, 5_000, -3):
+            replay.seek(tick)
+            expected = max(0, min(tick, TICKS))
+            assert replay.tick == expected
+            assert replay.model.snapshot() == states[expected]
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.replay"
+    path.write_bytes(b"not a replay file at all, but long enough for a header")
+    with pytest.raises(ReplayError):
+        Replay(str(path))
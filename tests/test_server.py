@@ -0,0 +1,71 @@
+import asyncio
+
+from array import array
+
+from model.state import STATE_SIZE, new_state
+from server import protocol
+from server.client import KEPT_STATES, MatchClient
+from server.match_server import MatchServer
+
+
+def test_input_before_first_state():
+    """An input sent before any state must not make the server send a
+    delta against a state the client never received"""
+
+    async def run() -> int:
+        server = MatchServer(tick_rate=1000)
+        host, port = await server.start()
+        match = server.create_match()
+        client = MatchClient()
+        try:
+            await client.connect(host, port, match.match_id, protocol.LEFT)
+            client.send_input(1)
+            for _ in range(50):
+                await client.receive()
+                client.send_input(1)
+            return client.tick
+        finally:
+            await client.close()
+            await server.stop()
+
+    assert asyncio.run(run()) > 0
+
+
+def test_client_evicts_states_across_gaps():
+    async def run() -> MatchClient:
+        client = MatchClient()
+        client._reader = asyncio.StreamReader()
+        state = new_state()
+        # every other tick, as sent to a client with a full write buffer
+        for tick in range(1, 4 * KEPT_STATES, 2):
+            client._reader.feed_data(protocol.encode_state(tick, state))
+            await client.receive()
+        return client
+
+    client = asyncio.run(run())
+    assert len(client.states) == KEPT_STATES // 2
+    assert min(client.states) > client.tick - KEPT_STATES
+
+
+def decode(message: bytes, base: array | None) -> tuple[int, int, int, array]:
+    _, tick, base_tick, mask = protocol.STATE_HEADER.unpack_from(message)
+    data = message[protocol.STATE_HEADER.size :]
+    assert len(data) == protocol.state_values_size(mask)
+    return tick, base_tick, mask, protocol.decode_state_values(mask, data, base)
+
+
+def test_delta_encoding_round_trip():
+    base = array("d", [350.0, 260.0, 5.0, 0.0, 200.0, 200.0, 0.0, 0.0])
+    state = array("d", base)
+    state[0], state[3], state[7] = 355.0, -1.25, 1.0
+    assert len(state) == STATE_SIZE
+
+    tick, base_tick, mask, decoded = decode(protocol.encode_state(8, state), None)
+    assert (tick, base_tick, mask) == (8, protocol.NO_BASE, protocol.FULL_MASK)
+    assert decoded == state
+
+    message = protocol.encode_state(8, state, 7, base)
+    tick, base_tick, mask, decoded = decode(message, base)
+    assert (tick, base_tick, mask) == (8, 7, 0b10001001)
+    assert decoded == state
+    assert len(message) == protocol.STATE_HEADER.size + 3 * protocol.STATE_FIELD.size
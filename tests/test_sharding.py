@@ -0,0 +1,75 @@
+import multiprocessing as mp
+import time
+
+import pytest
+
+from model.game_model import WIN_SCORE
+from server import sharding
+from server.sharding import SEQUENCE, SLOT_SIZE, ShardPool
+
+
+def _write_uniform_states(shm_name: str, ticks: int) -> None:
+    """Writes, with the seqlock of the workers, states whose fields all
+    hold the tick number, so a torn read has different fields"""
+    shm = sharding.SharedMemory(shm_name)
+    slots = shm.buf.cast("d")
+    try:
+        for tick in range(1, ticks + 1):
+            slots[SEQUENCE] = 2 * tick - 1
+            for i in range(1, SLOT_SIZE):
+                slots[i] = tick
+            slots[SEQUENCE] = 2 * tick
+    finally:
+        slots.release()
+        shm.close()
+
+
+def test_read_state_is_never_torn():
+    pool = ShardPool(1, 1)
+    pool.shm = sharding.SharedMemory(create=True, size=8 * SLOT_SIZE)
+    pool.slots = pool.shm.buf.cast("d")
+    writer = mp.Process(target=_write_uniform_states, args=(pool.shm.name, 200_000))
+    try:
+        writer.start()
+        reads = set()
+        while writer.is_alive():
+            state = pool.read_state(0)
+            assert len(set(state)) == 1, f"torn read {list(state)}"
+            reads.add(state[0])
+        assert len(reads) > 1
+    finally:
+        writer.join()
+        pool.stop()
+
+
+def test_workers_play_the_matches():
+    with ShardPool(4, 2) as pool:
+        deadline = time.perf_counter() + 10
+        while pool.total_ticks() < 4 * 500 and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        states = [pool.read_state(i) for i in range(4)]
+    assert all(0 <= state[6] <= WIN_SCORE and 0 <= state[7] <= WIN_SCORE for state in states)
+    # the computer players move the paddles away from the middle
+    assert {(state[4], state[5]) for state in states} != {(200.0, 200.0)}
+
+
+def test_read_state_gives_up_on_a_stuck_writer(monkeypatch):
+    monkeypatch.setattr(sharding, "READ_RETRIES", 200)
+    pool = ShardPool(1, 1)
+    pool.start()
+    pool.stop()  # keeps the block of a pool without workers
+    pool.shm = sharding.SharedMemory(create=True, size=8 * SLOT_SIZE)
+    pool.slots = pool.shm.buf.cast("d")
+    try:
+        pool.slots[SEQUENCE] = 1  # a worker died while writing
+        with pytest.raises(TimeoutError):
+            pool.read_state(0)
+        pool.slots[SEQUENCE] = 2
+        assert len(pool.read_state(0)) == SLOT_SIZE - 1
+    finally:
+        pool.stop()
+
+
+def test_rejects_empty_pools():
+    with pytest.raises(ValueError):
+        ShardPool(0)
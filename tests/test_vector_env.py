@@ -0,0 +1,23 @@
+import numpy as np
+
+from env.vector_env import OBS_BALL_X, PongVectorEnv
+
+
+def test_final_observation_is_before_reset():
+    env = PongVectorEnv(8)
+    observations = env.reset()
+    rng = np.random.default_rng(0)
+    finished = 0
+    for _ in range(20_000):
+        actions = rng.integers(-1, 2, size=(env.num_envs, 2))
+        observations, _, terminations, _, infos = env.step(actions)
+        if not terminations.any():
+            assert "final_observation" not in infos
+            continue
+        finished += int(terminations.sum())
+        final = infos["final_observation"][terminations]
+        assert np.array_equal(infos["_final_observation"], terminations)
+        assert not np.array_equal(final, observations[terminations])
+        # the ball of a finished match is at an edge, not served again
+        assert np.all((final[:, OBS_BALL_X] < 0.1) | (final[:, OBS_BALL_X] > 0.9))
+    assert finished > 0
@@ -0,0 +1,161 @@
+"""
+This module implements the capture of rendered frames without a visible
+window: an offscreen render target for the game and a writer thread that
+streams the frames, as raw RGB or as a PNG sequence, to disk or to a pipe
+(for example the standard input of a video encoder).
+"""
+import os
+import queue
+import threading
+from typing import BinaryIO
+
+import numpy as np
+import pygame
+
+from .game_view import GameView
+
+QUEUE_SIZE = 8  # frames waiting to be written before rendering blocks
+
+
+class FrameWriter:
+    """
+    Writes frames on its own thread.
+
+    The frames are copied into a fixed pool of buffers: when every buffer
+    is waiting to be written, 'submit' blocks until one is free, so a slow
+    sink slows the rendering down instead of using unbounded memory.
+
+    Attributes:
+        output (BinaryIO | str) : file object the raw RGB frames are written
+            to, or directory where the PNG files are saved
+        close_output (bool) : whether 'close' also closes the file object
+        frames (int) : number of frames written. After a write error no
+            more frames are written, and the error is raised by 'submit'
+            and 'close'.
+    """
+
+    def __init__(
+        self,
+        output: BinaryIO | str,
+        queue_size: int = QUEUE_SIZE,
+        close_output: bool = False,
+    ) -> None:
+        self.output = output
+        self.queue_size = queue_size
+        self.close_output = close_output
+        self.frames = 0
+        self._free: queue.Queue[np.ndarray] = queue.Queue()
+        self._pending: queue.Queue[np.ndarray | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._error: BaseException | None = None
+
+    def start(self, width: int, height: int) -> None:
+        """Allocates the buffers for 'width' x 'height' frames and starts
+        the writer thread"""
+        for _ in range(self.queue_size):
+            self._free.put(np.empty((height, width, 3), dtype=np.uint8))
+        if isinstance(self.output, str):
+            os.makedirs(self.output, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, pixels: np.ndarray) -> None:
+        """Queues a copy of 'pixels', a (width, height, 3) array as returned
+        by pygame.surfarray"""
+        if self._error is not None:
+            raise self._error
+        buffer = self._free.get()  # blocks while the writer is behind
+        np.copyto(buffer, pixels.transpose(1, 0, 2))
+        self._pending.put(buffer)
+
+    def close(self) -> int:
+        """Writes the pending frames, stops the thread and flushes (or
+        closes, if it's owned) the output file. Returns the number of frames
+        written, or raises the error that stopped the writing."""
+        if self._thread is not None:
+            self._pending.put(None)
+            self._thread.join()
+            self._thread = None
+        if not isinstance(self.output, str):
+            try:
+                if self.close_output:
+                    self.output.close()
+                else:
+                    self.output.flush()
+            except OSError as error:
+                if self._error is None:
+                    self._error = error
+        if self._error is not None:
+            raise self._error
+        return self.frames
+
+    def _run(self) -> None:
+        while (buffer := self._pending.get()) is not None:
+            if self._error is None:
+                try:
+                    self._write(buffer)
+                    self.frames += 1
+                except BaseException as error:  # reported by 'submit' and 'close'
+                    self._error = error
+            self._free.put(buffer)
+
+    def _write(self, buffer: np.ndarray) -> None:
+        if isinstance(self.output, str):
+            height, width, _ = buffer.shape
+            surface = pygame.image.frombuffer(buffer, (width, height), "RGB")
+            pygame.image.save(
+                surface, os.path.join(self.output, f"frame_{self.frames:06d}.png")
+            )
+        else:
+            self.output.write(buffer.data)
+
+
+class OffscreenView(GameView):
+    """
+    View that renders into an offscreen surface instead of a window and
+    hands every frame to a FrameWriter. It doesn't wait between frames,
+    so the game renders as fast as the writer keeps up.
+    """
+
+    headless = True
+    key_presses = ()
+    key_events = ()
+
+    def __init__(self, writer: FrameWriter | None = None) -> None:
+        self.writer = writer
+
+    def setup(self, window_name: str, window_width: int, window_height: int):
+        pygame.font.init()
+        self.window = pygame.Surface((window_width, window_height))
+        self.background = None
+        self.dirty_rects = []
+        self.previous_rects = []
+        self.full_update = True
+        if self.writer is not None:
+            self.writer.start(window_width, window_height)
+
+    def tick(self, fps: int) -> None:
+        pass
+
+    def frame_array(self) -> np.ndarray:
+        """Returns the current frame as a (width, height, 3) array that
+        references the pixels of the render target (no copy). The surface
+        stays locked while the array is alive."""
+        return pygame.surfarray.pixels3d(self.window)
+
+    def update(self) -> None:
+        """Sends the frame to the writer"""
+        self.previous_rects = self.dirty_rects
+        self.dirty_rects = []
+        self.full_update = False
+        if self.writer is not None:
+            pixels = self.frame_array()
+            self.writer.submit(pixels)
+            del pixels  # unlocks the surface
+
+    def check_if_quit(self) -> bool:
+        return False
+
+    def quit(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
@@ -1,41 +1,128 @@
+import time
+
 import pygame
-from typing import Callable
 
-# A function that takes a Surface as argument and performs a rendering into it.
-RenderFunction = Callable[[pygame.Surface], None]
+from .scene import RenderFunction, Scene
+from .sprite_atlas import drawn_rect
 
 
 class GameView:
     """
     Class responsible for managing what is rendered on the screen.
+
+    The static part of the screen is pre-rendered once into a background
+    surface (see 'set_background'). Every frame only the areas modified by
+    the render functions are restored from the background and sent to the
+    display, instead of redrawing and updating the whole window.
     """
 
+    headless = False
+    batch_sprites = True  # draw consecutive sprite nodes with a single Surface.blits
+
     def setup(self, window_name: str, window_width: int, window_height: int):
         pygame.init()
         self.window = pygame.display.set_mode((window_width, window_height))
         self.clock = pygame.time.Clock()
         pygame.display.set_caption(window_name)
+        self.background: pygame.Surface | None = None
+        self.dirty_rects: list[pygame.Rect] = []  # areas modified in this frame
+        self.previous_rects: list[pygame.Rect] = []  # areas modified in the last frame
+        self.full_update = True  # whether the whole window must be updated
+        self.key_presses: list[str] = []  # names of the keys pressed in the last frame
+        # (name, pressed, poll time) of the key events of the last frame
+        self.key_events: list[tuple[str, bool, float]] = []
 
     def tick(self, fps: int) -> None:
         """Sets the framerate of the window"""
         self.clock.tick(fps)
 
+    def set_background(self, *render_fns: RenderFunction) -> None:
+        """Pre-renders the static part of the screen with 'render_fns'"""
+        # same pixel format as the window, so restoring it is a plain copy
+        self.background = pygame.Surface(self.window.get_size(), 0, self.window)
+        for render_fn in render_fns:
+            render_fn(self.background)
+        self.window.blit(self.background, (0, 0))
+        self.previous_rects = []
+        self.full_update = True
+
+    def clear(self) -> None:
+        """Restores the background in the areas modified in the last frame"""
+        if self.background is None:
+            return
+        for rect in self.previous_rects:
+            self.window.blit(self.background, rect, rect)
+
     def render(self, *render_fns: RenderFunction) -> None:
         """Renders into self.window whatever comes inside render_fn"""
         for render_fn in render_fns:
-            render_fn(self.window)
+            rect = render_fn(self.window)
+            if rect is None:  # unknown area, the whole window must be updated
+                self.full_update = True
+            else:
+                self.dirty_rects.append(rect)
+
+    def render_scene(self, scene: Scene) -> None:
+        """Renders into self.window the visible nodes of 'scene', in order.
+        The consecutive sprite nodes are blitted together if
+        self.batch_sprites is True."""
+        window = self.window
+        dirty_rects = self.dirty_rects
+        batch_sprites = self.batch_sprites
+        sprites = []
+        for node in scene.nodes:
+            if not node.visible:
+                continue
+            if batch_sprites and node.sprite_fn is not None:
+                sprites.append(node.sprite_fn(window))
+                continue
+            if sprites:
+                self._blit_sprites(sprites)
+            rect = node.render_fn(window)
+            if rect is None:
+                self.full_update = True
+            else:
+                dirty_rects.append(rect)
+        if sprites:
+            self._blit_sprites(sprites)
+
+    def _blit_sprites(self, sprites: list) -> None:
+        """Blits the (sprite, position) pairs of 'sprites' with a single call
+        and empties the list"""
+        rects = self.window.blits(sprites)
+        for (sprite, position), rect in zip(sprites, rects):
+            self.dirty_rects.append(drawn_rect(sprite, position, rect))
+        sprites.clear()
 
     def update(self) -> None:
-        """Updates the window"""
-        pygame.display.update()
+        """Updates the areas of the window modified since the last update"""
+        if self.full_update:
+            pygame.display.update()
+            self.full_update = False
+        else:
+            pygame.display.update(self.previous_rects + self.dirty_rects)
+        self.previous_rects = self.dirty_rects
+        self.dirty_rects = []
 
     def check_if_quit(self) -> bool:
         """Returns True if the event of quitting has been created,
-        False if not."""
-        for event in pygame.event.get():
+        False if not. The keys pressed since the last call are kept
+        in self.key_presses and every key event in self.key_events."""
+        self.key_presses.clear()
+        self.key_events.clear()
+        quit = False
+        events = pygame.event.get()
+        now = time.perf_counter()
+        for event in events:
             if event.type == pygame.QUIT:
-                return True
-        return False
+                quit = True
+            elif event.type == pygame.KEYDOWN:
+                name = pygame.key.name(event.key)
+                self.key_presses.append(name)
+                self.key_events.append((name, True, now))
+            elif event.type == pygame.KEYUP:
+                self.key_events.append((pygame.key.name(event.key), False, now))
+        return quit
 
     def quit(self) -> None:
         """Quits the program"""
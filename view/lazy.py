@@ -0,0 +1,35 @@
+"""
+This module implements the deferred import of the rendering libraries,
+so the modules that only need pygame to draw can be imported by headless
+processes without loading SDL, or even having pygame installed.
+"""
+import importlib.util
+import sys
+from types import ModuleType
+
+
+class MissingModule:
+    """Placeholder of a module that is not installed. Using it raises the
+    ImportError that importing it would have raised."""
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+
+    def __getattr__(self, attribute: str):
+        raise ImportError(f"No module named '{self._name}'")
+
+
+def lazy_import(name: str) -> ModuleType | MissingModule:
+    """Returns the module 'name', which is only executed the first time
+    one of its attributes is used"""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        return MissingModule(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
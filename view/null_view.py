@@ -0,0 +1,39 @@
+from .scene import RenderFunction, Scene
+
+
+class NullView:
+    """
+    View that renders nothing and never waits. Used to run the game
+    headless, as fast as the CPU allows.
+    """
+
+    headless = True
+    key_presses = ()
+    key_events = ()
+
+    def setup(self, window_name: str, window_width: int, window_height: int):
+        pass
+
+    def tick(self, fps: int) -> None:
+        pass
+
+    def set_background(self, *render_fns: RenderFunction) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def render(self, *render_fns: RenderFunction) -> None:
+        pass
+
+    def render_scene(self, scene: Scene) -> None:
+        pass
+
+    def update(self) -> None:
+        pass
+
+    def check_if_quit(self) -> bool:
+        return False
+
+    def quit(self) -> None:
+        pass
@@ -0,0 +1,67 @@
+"""
+This module implements a retained scene: a persistent set of render
+nodes, built once and bound to the entities they draw, that the view
+walks every frame.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pygame
+
+# A function that takes a Surface as argument and performs a rendering into it.
+# It may return the area of the Surface it has modified, which allows the view
+# to update only that area of the screen.
+RenderFunction = Callable[["pygame.Surface"], "pygame.Rect | None"]
+
+
+@dataclass(slots=True, eq=False)
+class RenderNode:
+    """
+    Element of the scene.
+
+    Attributes:
+        render_fn (RenderFunction) : function that draws the node
+        z (int) : drawing order, nodes with lower 'z' are drawn first
+        kind (str) : draw type of the node. Nodes with the same 'z' and
+            'kind' are drawn one after the other so they can be batched.
+        visible (bool) : whether the node is drawn
+        sprite_fn (SpriteFunction | None) : for the nodes of kind 'sprite',
+            function returning the (surface, position) blitted by
+            'render_fn', which lets the view batch the blits
+    """
+
+    render_fn: RenderFunction
+    z: int = 0
+    kind: str = "draw"
+    visible: bool = True
+    sprite_fn: Callable[["pygame.Surface"], Any] | None = None
+
+
+class Scene:
+    """Set of RenderNodes kept sorted by drawing order"""
+
+    def __init__(self) -> None:
+        self.nodes: list[RenderNode] = []
+
+    def add(self, node: RenderNode) -> RenderNode:
+        """Adds 'node' to the scene and returns it"""
+        self.nodes.append(node)
+        self.nodes.sort(key=_draw_order)
+        return node
+
+    def remove(self, node: RenderNode) -> None:
+        """Removes 'node' from the scene"""
+        self.nodes.remove(node)
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+
+def _draw_order(node: RenderNode) -> tuple[int, str]:
+    return node.z, node.kind
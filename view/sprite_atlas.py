@@ -0,0 +1,114 @@
+"""
+This module implements the sprites of the moving entities: every shape
+is rasterized once into a surface with the pixel format of the surface
+it's drawn on, and then drawn with a plain blit every frame instead of
+being rasterized again.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Callable
+
+from .lazy import lazy_import
+from .scene import RenderNode
+
+pygame = lazy_import("pygame")
+
+Color = tuple[int, int, int]
+# A function that returns the sprite to draw into a Surface and where to
+# draw it (integer coordinates), as accepted by Surface.blits
+SpriteFunction = Callable[["pygame.Surface"], tuple["pygame.Surface", tuple[float, float]]]
+
+COLOR_KEYS: tuple[Color, Color] = ((255, 0, 255), (0, 255, 0))  # transparent colors
+
+
+class SpriteAtlas:
+    """
+    Bounded LRU cache of the sprites of the shapes, keyed by shape, size
+    and color, so a sprite is only rasterized again when one of them
+    changes. The sprites have the pixel format of the 'target' surface
+    they are requested for, and the cache is emptied if it changes.
+
+    Attributes:
+        max_size (int) : maximum number of sprites kept
+        target (pygame.Surface | None) : surface the sprites are drawn on
+        misses (int) : number of sprites rasterized
+    """
+
+    def __init__(self, max_size: int = 64) -> None:
+        self.max_size = max_size
+        self.sprites: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self.target: pygame.Surface | None = None
+        self.misses = 0
+
+    def circle(self, target: pygame.Surface, radius: int, color: Color) -> pygame.Surface:
+        """Returns the sprite of a circle of 'radius' and 'color'"""
+        return self._get(target, ("circle", radius, color))
+
+    def rect(self, target: pygame.Surface, width: int, height: int, color: Color) -> pygame.Surface:
+        """Returns the sprite of a 'width' x 'height' rectangle of 'color'"""
+        return self._get(target, ("rect", width, height, color))
+
+    def _get(self, target: pygame.Surface, key: tuple) -> pygame.Surface:
+        if target is not self.target:
+            self.sprites.clear()
+            self.target = target
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            return sprite
+
+        self.misses += 1
+        sprite = self.sprites[key] = _rasterize(target, key)
+        if len(self.sprites) > self.max_size:
+            self.sprites.popitem(last=False)
+        return sprite
+
+
+def _rasterize(target: pygame.Surface, key: tuple) -> pygame.Surface:
+    """Draws the shape described by 'key' into a new surface with the pixel
+    format of 'target'"""
+    if key[0] == "circle":
+        _, radius, color = key
+        # same pixels as pygame.draw.circle centered on the sprite
+        sprite = _surface(target, (2 * radius, 2 * radius), color)
+        pygame.draw.circle(sprite, color, (radius, radius), radius)
+    else:
+        _, width, height, color = key
+        sprite = pygame.Surface((width, height), 0, target)
+        sprite.fill(color)
+    return sprite
+
+
+def _surface(target: pygame.Surface, size: tuple[int, int], color: Color) -> pygame.Surface:
+    """Returns a transparent surface of 'size' with the format of 'target'"""
+    color_key = COLOR_KEYS[0] if color != COLOR_KEYS[0] else COLOR_KEYS[1]
+    surface = pygame.Surface(size, 0, target)
+    surface.fill(color_key)
+    surface.set_colorkey(color_key, pygame.RLEACCEL)
+    return surface
+
+
+def drawn_rect(sprite: pygame.Surface, position: tuple[int, int], rect: pygame.Rect):
+    """Returns the area reported by the draw call that 'sprite' replaces,
+    given 'rect', the area returned by blitting it at 'position'. They only
+    differ when the sprite is clipped by the target: the draw functions
+    report the bounding rect of the visible opaque pixels. A sprite that
+    is not visible at all gives an empty rect, like the draw calls, but not
+    always at the same position."""
+    if rect.size == sprite.get_size() or not (rect.width and rect.height):
+        return rect
+    visible = rect.move(-position[0], -position[1])
+    return sprite.subsurface(visible).get_bounding_rect().move(rect.topleft)
+
+
+def sprite_node(sprite_fn: SpriteFunction, z: int = 0) -> RenderNode:
+    """Returns a scene node of kind 'sprite' that draws 'sprite_fn'. Views
+    able to batch blits draw the consecutive sprite nodes with a single
+    Surface.blits call."""
+
+    def render(window: pygame.Surface) -> pygame.Rect:
+        sprite, position = sprite_fn(window)
+        return drawn_rect(sprite, position, window.blit(sprite, position))
+
+    return RenderNode(render, z, kind="sprite", sprite_fn=sprite_fn)
@@ -0,0 +1,71 @@
+"""
+This module implements the caches used to render text. Resolving a
+system font and rasterizing a text are slow operations, while the texts
+shown by the game (scores, messages) rarely change.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+
+from .lazy import lazy_import
+
+pygame = lazy_import("pygame")
+
+# A font is described by its name and size, as in pygame.font.SysFont
+FontSpec = tuple[str, int]
+Color = tuple[int, int, int]
+
+
+class FontRegistry:
+    """Resolves every font once and keeps it for later use"""
+
+    def __init__(self) -> None:
+        self.fonts: dict[FontSpec, pygame.font.Font] = {}
+
+    def get(self, font: FontSpec) -> pygame.font.Font:
+        """Returns the pygame Font described by 'font'"""
+        if font not in self.fonts:
+            self.fonts[font] = pygame.font.SysFont(*font)
+        return self.fonts[font]
+
+
+class TextCache:
+    """
+    Bounded LRU cache of rendered text surfaces keyed by (text, font, color).
+
+    Attributes:
+        fonts (FontRegistry) : registry the fonts are resolved with
+        max_size (int) : maximum number of surfaces kept
+        hits (int) : number of renders served from the cache
+        misses (int) : number of renders that rasterized the text
+    """
+
+    def __init__(self, fonts: FontRegistry | None = None, max_size: int = 64) -> None:
+        self.fonts = fonts or FontRegistry()
+        self.max_size = max_size
+        self.surfaces: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text: str, font: FontSpec, color: Color) -> pygame.Surface:
+        """Returns a surface with 'text' rendered (antialiased) with 'font'
+        and 'color'"""
+        key = (text, font, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.fonts.get(font).render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self) -> None:
+        """Removes every cached surface and resets the counters"""
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0